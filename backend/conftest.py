@@ -0,0 +1,59 @@
+"""
+Pytest configuration shared by every test directory in the backend.
+
+Loaded before the conftest files under src/backend/tests and tests, so
+settings made here are in place before those import the app.
+"""
+
+import hashlib
+import os
+import shutil
+from pathlib import Path
+
+_BACKEND_DIR = Path(__file__).parent
+
+# Under pytest-xdist every worker runs the app's startup migrations, so give
+# each one its own SQLite file instead of racing on the shared database
+_xdist_worker = os.getenv("PYTEST_XDIST_WORKER")
+_worker_db = None
+if _xdist_worker and "DATABASE_URL" not in os.environ:
+    _worker_db = Path(f"test-{_xdist_worker}.db")
+    os.environ["DATABASE_URL"] = f"sqlite:///./{_worker_db}"
+
+
+def _schema_key() -> str:
+    """Hash the migrations and models, so schema changes give a new template."""
+    digest = hashlib.sha256()
+    sources = sorted((_BACKEND_DIR / "alembic" / "versions").glob("*.py"))
+    sources.append(_BACKEND_DIR / "src" / "backend" / "database" / "models.py")
+    for path in sources:
+        digest.update(path.read_bytes())
+    return digest.hexdigest()[:16]
+
+
+def pytest_configure(config):
+    """
+    Give each pytest-xdist worker's database the app's schema.
+
+    Tests that make their own client without entering the app's lifespan
+    expect the tables its startup migrations create, as they find in the
+    dev database on a serial run. The first worker to need the schema
+    migrates its own database and saves a copy as a template, renamed into
+    place so other workers never read it half-written; later workers, and
+    later runs with the same migrations, just copy the template.
+    """
+    if _worker_db is None:
+        return
+
+    template = Path(f"test-schema-{_schema_key()}.db")
+    if template.exists():
+        shutil.copyfile(template, _worker_db)
+        return
+
+    from backend.main import init_database
+
+    _worker_db.unlink(missing_ok=True)
+    init_database()
+    partial = template.with_name(f"{template.name}.{_xdist_worker}.tmp")
+    shutil.copyfile(_worker_db, partial)
+    os.replace(partial, template)
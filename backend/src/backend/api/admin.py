@@ -385,7 +385,7 @@ async def get_driver_recommendations(booking_id: str, db: Session = Depends(get_
             ]
         }
     """
-    from services.route_optimizer import recommend_drivers
+    from services.route_optimizer import recommend_drivers_async
 
     # Get the booking
     booking = db.query(Booking).filter(Booking.booking_id == booking_id).first()
@@ -433,7 +433,7 @@ async def get_driver_recommendations(booking_id: str, db: Session = Depends(get_
     }
 
     # Get recommendations
-    recommendations = recommend_drivers(
+    recommendations = await recommend_drivers_async(
         drivers_dict,
         bookings_dict,
         new_booking_dict,
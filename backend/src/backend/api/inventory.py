@@ -135,6 +135,82 @@ def is_within_service_area(
     return True
 
 
+# ============================================================================
+# CACHE HELPERS
+# ============================================================================
+
+
+def inventory_cache_key(
+    skip: int = 0,
+    limit: int = 50,
+    category: Optional[str] = None,
+    status: Optional[str] = None,
+    warehouse_id: Optional[str] = None,
+    include_partner_inventory: bool = True,
+) -> str:
+    """
+    Build the cache key for a page of the inventory list.
+
+    Defaults match the list_inventory query parameters, so calling this
+    without arguments gives the key for the default first page.
+
+    Returns:
+        Cache key such as "inventory:0:50:None:None:None:True"
+    """
+    return (
+        f"inventory:{skip}:{limit}:{category}:{status}:"
+        f"{warehouse_id}:{include_partner_inventory}"
+    )
+
+
+def build_inventory_page(
+    items: List[InventoryItem], total_count: int, skip: int, limit: int
+) -> Dict[str, Any]:
+    """
+    Build the paginated inventory list response.
+
+    Args:
+        items: Inventory items on this page
+        total_count: Number of items matching the filters across all pages
+        skip: Number of items skipped
+        limit: Page size
+
+    Returns:
+        Paginated response with items and metadata
+    """
+    return {
+        "items": jsonable_encoder(items),
+        "total": total_count,
+        "skip": skip,
+        "limit": limit,
+        "has_more": (skip + limit) < total_count
+    }
+
+
+def warm_inventory_cache(db: Session, limit: int = 50) -> None:
+    """
+    Preload the default first page of the inventory list into the cache.
+
+    Called at startup so the first GET /api/inventory after a restart is
+    served from memory. Items and their photos are loaded with a single
+    SELECT (plus the COUNT for the page total).
+
+    Args:
+        db: Database session
+        limit: Page size to preload (default matches list_inventory)
+    """
+    from sqlalchemy.orm import joinedload
+
+    query = db.query(InventoryItem).options(joinedload(InventoryItem.photos))
+    total_count = query.count()
+    items = query.limit(limit).all()
+
+    inventory_cache.set(
+        inventory_cache_key(limit=limit),
+        build_inventory_page(items, total_count, 0, limit),
+    )
+
+
 @router.post("/", response_model=InventoryItemSchema, status_code=status.HTTP_201_CREATED)
 async def create_inventory_item(
     item_data: InventoryItemCreate,
@@ -224,7 +300,9 @@ async def list_inventory(
 
     # Create cache key based on query parameters
     # Note: We exclude location params from cache as they vary widely
-    cache_key = f"inventory:{skip}:{limit}:{category}:{status}:{warehouse_id}:{include_partner_inventory}"
+    cache_key = inventory_cache_key(
+        skip, limit, category, status, warehouse_id, include_partner_inventory
+    )
 
     # Try to get from cache (only if no location filtering)
     if not (customer_lat or customer_lng or customer_city):
@@ -275,13 +353,7 @@ async def list_inventory(
                 # Include partner items without location specified
                 filtered_items.append(item)
 
-        response = {
-            "items": jsonable_encoder(filtered_items),
-            "total": total_count,
-            "skip": skip,
-            "limit": limit,
-            "has_more": (skip + limit) < total_count
-        }
+        response = build_inventory_page(filtered_items, total_count, skip, limit)
         # Don't cache location-based queries
         return response
     elif not include_partner_inventory:
@@ -291,24 +363,12 @@ async def list_inventory(
             for item in items
             if item.ownership_type != OwnershipType.PARTNER_INVENTORY.value
         ]
-        response = {
-            "items": jsonable_encoder(filtered_items),
-            "total": total_count,
-            "skip": skip,
-            "limit": limit,
-            "has_more": (skip + limit) < total_count
-        }
+        response = build_inventory_page(filtered_items, total_count, skip, limit)
         # Cache the response
         inventory_cache.set(cache_key, response)
         return response
 
-    response = {
-        "items": jsonable_encoder(items),
-        "total": total_count,
-        "skip": skip,
-        "limit": limit,
-        "has_more": (skip + limit) < total_count
-    }
+    response = build_inventory_page(items, total_count, skip, limit)
     # Cache the response
     inventory_cache.set(cache_key, response)
     return response
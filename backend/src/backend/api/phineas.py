@@ -83,7 +83,7 @@ async def scan_driver_assignments(db: Session = Depends(get_db)):
         }
     """
     from backend.database.models import BookingStatus
-    from services.route_optimizer import recommend_drivers
+    from services.route_optimizer import recommend_drivers_async
 
     # Get all unassigned trips
     bookings = (
@@ -140,7 +140,7 @@ async def scan_driver_assignments(db: Session = Depends(get_db)):
                 "delivery_lng": float(booking.delivery_lng) if booking.delivery_lng else None
             }
 
-            recommendations = recommend_drivers(
+            recommendations = await recommend_drivers_async(
                 drivers_dict,
                 all_bookings_dict,
                 new_booking_dict,
@@ -203,7 +203,7 @@ async def scan_driver_assignments(db: Session = Depends(get_db)):
                 "delivery_lng": float(booking.delivery_lng) if booking.delivery_lng else None
             }
 
-            recommendations = recommend_drivers(
+            recommendations = await recommend_drivers_async(
                 drivers_dict,
                 all_bookings_dict,
                 new_booking_dict,
@@ -5,6 +5,7 @@ Following Pydantic v2 standards with strict validation and proper types.
 All schemas use ConfigDict for ORM mode and validation settings.
 """
 
+import re
 from datetime import datetime, date
 from decimal import Decimal
 from typing import List, Optional, Any
@@ -27,6 +28,26 @@ from backend.database.models import (
 )
 
 
+# Separator for comma-separated allowed_surfaces, swallowing surrounding whitespace
+_SURFACE_SEPARATOR = re.compile(r"\s*,\s*")
+
+
+def _split_surfaces(value: str) -> List[str]:
+    """
+    Split a comma-separated surfaces string into a list.
+
+    Args:
+        value: Comma-separated surfaces (e.g. "grass, concrete")
+
+    Returns:
+        Trimmed, non-empty surface names
+    """
+    value = value.strip()
+    if "," not in value:
+        return [value] if value else []
+    return [surface for surface in _SURFACE_SEPARATOR.split(value) if surface]
+
+
 # Base configuration for all schemas
 class BaseSchema(BaseModel):
     """Base schema with common configuration."""
@@ -177,7 +198,7 @@ class InventoryItem(InventoryItemBase):
             allowed_surfaces = data.get("allowed_surfaces")
             if isinstance(allowed_surfaces, str) and allowed_surfaces:
                 data = data.copy()  # Don't mutate original
-                data["allowed_surfaces"] = [s.strip() for s in allowed_surfaces.split(",") if s.strip()]
+                data["allowed_surfaces"] = _split_surfaces(allowed_surfaces)
             elif allowed_surfaces == "":
                 data = data.copy()
                 data["allowed_surfaces"] = []
@@ -193,7 +214,7 @@ class InventoryItem(InventoryItemBase):
             # Now handle allowed_surfaces in the dict
             allowed_surfaces = data_dict.get("allowed_surfaces")
             if isinstance(allowed_surfaces, str) and allowed_surfaces:
-                data_dict["allowed_surfaces"] = [s.strip() for s in allowed_surfaces.split(",") if s.strip()]
+                data_dict["allowed_surfaces"] = _split_surfaces(allowed_surfaces)
             elif allowed_surfaces == "":
                 data_dict["allowed_surfaces"] = []
 
@@ -236,6 +257,11 @@ class InventoryPhoto(InventoryPhotoBase):
     created_at: datetime
 
 
+# Resolve the InventoryPhoto forward reference now so the validator is
+# built at import time instead of on the first request
+InventoryItem.model_rebuild()
+
+
 class InventoryPhotoReorder(BaseSchema):
     """Schema for reordering photos."""
 
@@ -20,18 +20,16 @@ from backend.database import Base, engine
 settings = get_settings()
 
 
-@asynccontextmanager
-async def lifespan(app: FastAPI):
+def init_database() -> None:
     """
-    Application lifespan manager.
+    Bring the database schema up to date.
 
-    Handles startup and shutdown events.
+    Runs the Alembic migrations, falling back to Base.metadata.create_all
+    if they can't run.
     """
-    # Startup: Run database migrations
     try:
         from alembic.config import Config
         from alembic import command
-        import os
 
         # Get the alembic.ini path
         backend_dir = Path(__file__).parent.parent.parent
@@ -51,6 +49,32 @@ async def lifespan(app: FastAPI):
         Base.metadata.create_all(bind=engine)
 
     print("Database tables created/verified")
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """
+    Application lifespan manager.
+
+    Handles startup and shutdown events.
+    """
+    # Startup: Run database migrations
+    init_database()
+
+    # Startup: Preload the default inventory page into the cache
+    try:
+        from backend.api.inventory import warm_inventory_cache
+        from backend.database.connection import SessionLocal
+
+        db = SessionLocal()
+        try:
+            warm_inventory_cache(db)
+        finally:
+            db.close()
+        print("Inventory cache warmed")
+    except Exception as e:
+        print(f"⚠️ Inventory cache warm-up skipped: {e}")
+
     print(f"API running on http://{settings.api_host}:{settings.api_port}")
     print(f"API docs available at http://{settings.api_host}:{settings.api_port}/docs")
 
@@ -59,6 +83,14 @@ async def lifespan(app: FastAPI):
     # Shutdown
     print("Shutting down API...")
 
+    # Close the async geocoder's HTTP client
+    try:
+        from services.geocoding_async import aclose as close_geocoding_client
+
+        await close_geocoding_client()
+    except Exception as e:
+        print(f"⚠️ Geocoding client shutdown skipped: {e}")
+
 
 # Create FastAPI application
 app = FastAPI(
@@ -2,10 +2,15 @@
 Pytest configuration and fixtures for testing.
 """
 
+import hashlib
+import os
+import sqlite3
+
 import pytest
 from fastapi.testclient import TestClient
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.schema import CreateIndex, CreateTable
 from sqlalchemy.pool import StaticPool
 from datetime import date, datetime
 from decimal import Decimal
@@ -13,6 +18,12 @@ from decimal import Decimal
 from backend.main import app
 from backend.database.models import Base
 from backend.database.connection import get_db
+from backend.utils.cache import inventory_cache
+
+
+# Decimal amounts parsed once and shared by the sample fixtures;
+# Decimals are immutable, so reusing the instances is safe
+_D = {s: Decimal(s) for s in ("20.00", "50.00", "250.00", "320.00")}
 
 
 # Create in-memory SQLite database for testing
@@ -27,16 +38,92 @@ engine = create_engine(
 TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
 
+@event.listens_for(engine, "connect")
+def _disable_pysqlite_transactions(dbapi_connection, connection_record):
+    """Stop pysqlite from managing transactions so SAVEPOINTs nest correctly."""
+    dbapi_connection.isolation_level = None
+
+
+@event.listens_for(engine, "begin")
+def _emit_begin(conn):
+    """Emit BEGIN ourselves now that pysqlite no longer does."""
+    conn.exec_driver_sql("BEGIN")
+
+
+def _schema_fingerprint() -> str:
+    """Hash the DDL for every table and index so schema edits change the key."""
+    ddl = []
+    for table in Base.metadata.sorted_tables:
+        ddl.append(str(CreateTable(table).compile(dialect=engine.dialect)))
+        for index in sorted(table.indexes, key=lambda i: i.name or ""):
+            ddl.append(str(CreateIndex(index).compile(dialect=engine.dialect)))
+    return hashlib.sha256("\n".join(ddl).encode()).hexdigest()[:16]
+
+
+def _load_cached_schema(cache_dir) -> None:
+    """
+    Copy a prebuilt schema into the in-memory database.
+
+    The template file is built with create_all the first time a given
+    schema is seen and reused by later sessions via the SQLite backup API.
+    Each pytest-xdist worker builds into its own temporary file and renames
+    it into place, so concurrent workers never read a half-written template.
+    """
+    template = cache_dir / f"schema-{_schema_fingerprint()}.sqlite"
+    if not template.exists():
+        worker_id = os.getenv("PYTEST_XDIST_WORKER", "main")
+        partial = template.with_name(f"{template.name}.{worker_id}.tmp")
+        partial.unlink(missing_ok=True)
+        template_engine = create_engine(f"sqlite:///{partial}")
+        Base.metadata.create_all(bind=template_engine)
+        template_engine.dispose()
+        os.replace(partial, template)
+
+    source = sqlite3.connect(template)
+    try:
+        with engine.connect() as conn:
+            source.backup(conn.connection.driver_connection)
+    finally:
+        source.close()
+
+
+@pytest.fixture(scope="session")
+def schema(request):
+    """
+    Create all tables once for the whole test session.
+
+    Set PYTEST_CACHE_DB=1 to restore the schema from a template cached in
+    pytest's cache directory instead of running create_all every session.
+
+    The database is in-memory, so every pytest-xdist worker process gets
+    its own copy and tests can run in parallel with ``pytest -n auto``.
+    """
+    cache = getattr(request.config, "cache", None)
+    if os.getenv("PYTEST_CACHE_DB") == "1" and cache is not None:
+        _load_cached_schema(cache.mkdir("schema"))
+    else:
+        Base.metadata.create_all(bind=engine)
+    yield
+    Base.metadata.drop_all(bind=engine)
+
+
 @pytest.fixture(scope="function")
-def db():
-    """Create a fresh database for each test."""
-    Base.metadata.create_all(bind=engine)
-    db = TestingSessionLocal()
+def db(schema):
+    """
+    Provide a session whose changes are rolled back after each test.
+
+    The session joins an outer transaction and runs inside a SAVEPOINT,
+    so commits made by tests or API endpoints never reach the database.
+    """
+    connection = engine.connect()
+    transaction = connection.begin()
+    db = TestingSessionLocal(bind=connection, join_transaction_mode="create_savepoint")
     try:
         yield db
     finally:
         db.close()
-        Base.metadata.drop_all(bind=engine)
+        transaction.rollback()
+        connection.close()
 
 
 @pytest.fixture(scope="function")
@@ -50,8 +137,13 @@ def client(db):
 
     app.dependency_overrides[get_db] = override_get_db
     with TestClient(app) as test_client:
+        # Each test's writes are rolled back with its SAVEPOINT, so cached
+        # inventory responses from a previous test (or from the startup
+        # warm-up against the real database) would be stale
+        inventory_cache.clear()
         yield test_client
     app.dependency_overrides.clear()
+    inventory_cache.clear()
 
 
 @pytest.fixture
@@ -66,8 +158,7 @@ def sample_warehouse(db):
         is_active=True
     )
     db.add(warehouse)
-    db.commit()
-    db.refresh(warehouse)
+    db.flush()
     return warehouse
 
 
@@ -84,8 +175,7 @@ def sample_customer(db):
         address_lng=Decimal("-117.9190")
     )
     db.add(customer)
-    db.commit()
-    db.refresh(customer)
+    db.flush()
     return customer
 
 
@@ -101,8 +191,7 @@ def sample_driver(db):
         is_active=True
     )
     db.add(driver)
-    db.commit()
-    db.refresh(driver)
+    db.flush()
     return driver
 
 
@@ -113,7 +202,7 @@ def sample_inventory_item(db, sample_warehouse):
     item = InventoryItem(
         name="Bounce House Castle",
         category="Inflatables",
-        base_price=Decimal("250.00"),
+        base_price=_D["250.00"],
         requires_power=True,
         min_space_sqft=225,
         allowed_surfaces="grass,artificial_turf",
@@ -122,8 +211,7 @@ def sample_inventory_item(db, sample_warehouse):
         status=InventoryStatus.AVAILABLE
     )
     db.add(item)
-    db.commit()
-    db.refresh(item)
+    db.flush()
     return item
 
 
@@ -142,28 +230,24 @@ def sample_booking(db, sample_customer, sample_inventory_item, sample_driver):
         delivery_lat=Decimal("33.6415"),
         delivery_lng=Decimal("-117.9190"),
         setup_instructions="Setup in backyard",
-        subtotal=Decimal("250.00"),
-        delivery_fee=Decimal("50.00"),
-        tip=Decimal("20.00"),
-        total=Decimal("320.00"),
+        subtotal=_D["250.00"],
+        delivery_fee=_D["50.00"],
+        tip=_D["20.00"],
+        total=_D["320.00"],
         status=BookingStatus.CONFIRMED,
         assigned_driver_id=sample_driver.driver_id,
         payment_status=PaymentStatus.PAID
     )
-    db.add(booking)
-    db.commit()
-    db.refresh(booking)
 
-    # Add booking item
-    booking_item = BookingItem(
-        booking_id=booking.booking_id,
+    # Add booking item so both rows are inserted by a single flush
+    booking.booking_items.append(BookingItem(
         inventory_item_id=sample_inventory_item.inventory_item_id,
         quantity=1,
-        price=Decimal("250.00"),
+        price=_D["250.00"],
         pickup_warehouse_id=sample_inventory_item.current_warehouse_id,
         return_warehouse_id=sample_inventory_item.current_warehouse_id
-    )
-    db.add(booking_item)
-    db.commit()
+    ))
+    db.add(booking)
+    db.flush()
 
     return booking
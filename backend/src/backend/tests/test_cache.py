@@ -0,0 +1,131 @@
+"""
+Unit tests for the in-memory TTL cache.
+
+Tests storage, expiration, and pattern invalidation.
+"""
+
+import threading
+import time
+
+from backend.utils.cache import InMemoryCache
+
+
+class TestInMemoryCache:
+    """Tests for basic get/set/delete behavior."""
+
+    def test_set_and_get(self):
+        """Test that a stored value can be read back."""
+        cache = InMemoryCache(ttl_seconds=60)
+        cache.set("inventory:1", {"name": "Bounce House"})
+
+        assert cache.get("inventory:1") == {"name": "Bounce House"}
+
+    def test_get_missing_key(self):
+        """Test that unknown keys return None."""
+        cache = InMemoryCache(ttl_seconds=60)
+
+        assert cache.get("inventory:missing") is None
+        assert cache.get("no-namespace") is None
+
+    def test_expired_entry_returns_none(self):
+        """Test that entries are not returned after their TTL."""
+        cache = InMemoryCache(ttl_seconds=60)
+        cache.set("inventory:1", "value", ttl_seconds=0)
+        time.sleep(0.01)
+
+        assert cache.get("inventory:1") is None
+        assert cache.get_stats()["entry_count"] == 0
+
+    def test_overwritten_entry_survives_old_expiry(self):
+        """Test that an entry set again outlives its earlier expiry time."""
+        cache = InMemoryCache(ttl_seconds=60)
+        cache.set("inventory:1", "old", ttl_seconds=0)
+        cache.set("inventory:1", "new")
+        time.sleep(0.01)
+
+        stats = cache.get_stats()
+
+        assert stats["keys"] == ["inventory:1"]
+        assert cache.get("inventory:1") == "new"
+
+    def test_delete(self):
+        """Test removing a single key."""
+        cache = InMemoryCache(ttl_seconds=60)
+        cache.set("inventory:1", "a")
+        cache.set("inventory:2", "b")
+        cache.delete("inventory:1")
+        cache.delete("inventory:unknown")
+
+        assert cache.get("inventory:1") is None
+        assert cache.get("inventory:2") == "b"
+
+    def test_concurrent_writers(self):
+        """Test that writes from many threads across shards are all kept."""
+        cache = InMemoryCache(ttl_seconds=60)
+
+        def write(worker):
+            for i in range(200):
+                cache.set(f"inventory:{worker}:{i}", i)
+
+        threads = [threading.Thread(target=write, args=(w,)) for w in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert cache.get_stats()["entry_count"] == 8 * 200
+        assert cache.get("inventory:7:199") == 199
+
+
+class TestInMemoryCacheInvalidation:
+    """Tests for clear and clear_pattern."""
+
+    def test_clear_pattern_namespace(self):
+        """Test that a "namespace:" pattern drops only that namespace."""
+        cache = InMemoryCache(ttl_seconds=60)
+        cache.set("inventory:0:50", "page")
+        cache.set("inventory:50:50", "page 2")
+        cache.set("bookings:1", "booking")
+        cache.set("plain", "value")
+
+        cache.clear_pattern("inventory:")
+
+        assert cache.get("inventory:0:50") is None
+        assert cache.get("inventory:50:50") is None
+        assert cache.get("bookings:1") == "booking"
+        assert cache.get("plain") == "value"
+
+    def test_clear_pattern_substring(self):
+        """Test that other patterns still match anywhere in the key."""
+        cache = InMemoryCache(ttl_seconds=60)
+        cache.set("inventory:0:50:Inflatables", "a")
+        cache.set("inventory:0:50:Tents", "b")
+        cache.set("plain-Inflatables", "c")
+
+        cache.clear_pattern("Inflatables")
+
+        assert cache.get("inventory:0:50:Inflatables") is None
+        assert cache.get("plain-Inflatables") is None
+        assert cache.get("inventory:0:50:Tents") == "b"
+
+    def test_clear(self):
+        """Test that clear removes every entry."""
+        cache = InMemoryCache(ttl_seconds=60)
+        cache.set("inventory:1", "a")
+        cache.set("plain", "b")
+
+        cache.clear()
+
+        assert cache.get_stats()["entry_count"] == 0
+
+    def test_get_stats(self):
+        """Test that stats report live keys across namespaces."""
+        cache = InMemoryCache(ttl_seconds=60)
+        cache.set("inventory:1", "a")
+        cache.set("plain", "b")
+
+        stats = cache.get_stats()
+
+        assert stats["entry_count"] == 2
+        assert stats["ttl_seconds"] == 60
+        assert sorted(stats["keys"]) == ["inventory:1", "plain"]
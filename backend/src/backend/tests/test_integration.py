@@ -5,6 +5,7 @@ Tests end-to-end business processes across multiple components.
 
 import pytest
 from datetime import date, timedelta
+from sqlalchemy import event
 
 
 class TestCompleteBookingFlow:
@@ -182,6 +183,30 @@ class TestInventoryManagement:
         inventory_after = inventory_response.json()
         assert len(inventory_after) >= initial_count
 
+    def test_inventory_list_is_cached(self, client, db, sample_inventory_item):
+        """Test that repeated inventory listings are served from the cache."""
+        statements = []
+
+        def count_selects(conn, cursor, statement, parameters, context, executemany):
+            if statement.lstrip().upper().startswith("SELECT"):
+                statements.append(statement)
+
+        engine = db.get_bind()
+        event.listen(engine, "before_cursor_execute", count_selects)
+        try:
+            first = client.get("/api/inventory/")
+            queries_after_first = len(statements)
+            second = client.get("/api/inventory/")
+        finally:
+            event.remove(engine, "before_cursor_execute", count_selects)
+
+        assert first.status_code == 200
+        assert second.status_code == 200
+        assert second.json() == first.json()
+        assert queries_after_first > 0
+        # Second request must not touch the database
+        assert len(statements) == queries_after_first
+
 
 class TestConflictDetection:
     """Test booking conflict detection."""
@@ -7,6 +7,7 @@ import pytest
 from datetime import date, datetime
 from decimal import Decimal
 from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import raiseload, selectinload
 
 from backend.database.models import (
     Customer, Warehouse, InventoryItem, Driver, Booking, BookingItem,
@@ -14,6 +15,14 @@ from backend.database.models import (
 )
 
 
+# Decimal amounts parsed once per module and shared across tests;
+# Decimals are immutable, so reusing the instances is safe
+_D = {s: Decimal(s) for s in (
+    "-100.00", "0.00", "20.00", "50.00", "100.00",
+    "250.00", "300.00", "320.00", "350.00",
+)}
+
+
 class TestCustomerModel:
     """Test the Customer model."""
 
@@ -25,13 +34,13 @@ class TestCustomerModel:
             phone="7145550100"
         )
         db.add(customer)
-        db.commit()
+        db.flush()
         db.refresh(customer)
 
         assert customer.customer_id is not None
         assert customer.name == "Test Customer"
         assert customer.total_bookings == 0
-        assert customer.total_spent == Decimal("0.00")
+        assert customer.total_spent == _D["0.00"]
         assert customer.created_at is not None
 
     def test_customer_requires_name(self, db):
@@ -43,7 +52,7 @@ class TestCustomerModel:
         )
         db.add(customer)
         with pytest.raises(IntegrityError):
-            db.commit()
+            db.flush()
 
     def test_customer_requires_email(self, db):
         """Test that customer email is required."""
@@ -54,7 +63,7 @@ class TestCustomerModel:
         )
         db.add(customer)
         with pytest.raises(IntegrityError):
-            db.commit()
+            db.flush()
 
 
 class TestWarehouseModel:
@@ -70,7 +79,7 @@ class TestWarehouseModel:
             is_active=True
         )
         db.add(warehouse)
-        db.commit()
+        db.flush()
         db.refresh(warehouse)
 
         assert warehouse.warehouse_id is not None
@@ -87,7 +96,7 @@ class TestWarehouseModel:
         )
         db.add(warehouse)
         with pytest.raises(IntegrityError):
-            db.commit()
+            db.flush()
 
 
 class TestInventoryItemModel:
@@ -98,7 +107,7 @@ class TestInventoryItemModel:
         item = InventoryItem(
             name="Test Item",
             category="Test Category",
-            base_price=Decimal("100.00"),
+            base_price=_D["100.00"],
             requires_power=True,
             min_space_sqft=100,
             allowed_surfaces="grass,concrete",
@@ -107,12 +116,12 @@ class TestInventoryItemModel:
             status=InventoryStatus.AVAILABLE
         )
         db.add(item)
-        db.commit()
+        db.flush()
         db.refresh(item)
 
         assert item.inventory_item_id is not None
         assert item.name == "Test Item"
-        assert item.base_price == Decimal("100.00")
+        assert item.base_price == _D["100.00"]
         assert item.status == InventoryStatus.AVAILABLE
 
     def test_inventory_item_requires_positive_price(self, db, sample_warehouse):
@@ -120,12 +129,12 @@ class TestInventoryItemModel:
         item = InventoryItem(
             name="Test Item",
             category="Test Category",
-            base_price=Decimal("-100.00"),  # Negative price
+            base_price=_D["-100.00"],  # Negative price
             default_warehouse_id=sample_warehouse.warehouse_id,
             status=InventoryStatus.AVAILABLE
         )
         db.add(item)
-        db.commit()  # Will succeed at DB level, validation happens at API level
+        db.flush()  # Will succeed at DB level, validation happens at API level
 
 
 class TestDriverModel:
@@ -140,13 +149,13 @@ class TestDriverModel:
             is_active=True
         )
         db.add(driver)
-        db.commit()
+        db.flush()
         db.refresh(driver)
 
         assert driver.driver_id is not None
         assert driver.name == "Test Driver"
         assert driver.total_deliveries == 0
-        assert driver.total_earnings == Decimal("0.00")
+        assert driver.total_earnings == _D["0.00"]
 
     def test_driver_requires_name(self, db):
         """Test that driver name is required."""
@@ -156,7 +165,7 @@ class TestDriverModel:
         )
         db.add(driver)
         with pytest.raises(IntegrityError):
-            db.commit()
+            db.flush()
 
 
 class TestBookingModel:
@@ -169,16 +178,16 @@ class TestBookingModel:
             delivery_date=date(2025, 11, 1),
             pickup_date=date(2025, 11, 3),
             delivery_address="123 Test St",
-            subtotal=Decimal("250.00"),
-            delivery_fee=Decimal("50.00"),
-            tip=Decimal("20.00"),
-            total=Decimal("320.00"),
+            subtotal=_D["250.00"],
+            delivery_fee=_D["50.00"],
+            tip=_D["20.00"],
+            total=_D["320.00"],
             status=BookingStatus.PENDING,
             assigned_driver_id=sample_driver.driver_id,
             payment_status=PaymentStatus.PENDING
         )
         db.add(booking)
-        db.commit()
+        db.flush()
         db.refresh(booking)
 
         assert booking.booking_id is not None
@@ -193,15 +202,15 @@ class TestBookingModel:
             delivery_date=date(2025, 11, 1),
             pickup_date=date(2025, 11, 3),
             delivery_address="123 Test St",
-            subtotal=Decimal("250.00"),
-            delivery_fee=Decimal("50.00"),
-            tip=Decimal("0.00"),
-            total=Decimal("300.00"),
+            subtotal=_D["250.00"],
+            delivery_fee=_D["50.00"],
+            tip=_D["0.00"],
+            total=_D["300.00"],
             status=BookingStatus.PENDING,
             payment_status=PaymentStatus.PENDING
         )
         db.add(booking1)
-        db.commit()
+        db.flush()
         db.refresh(booking1)
 
         booking2 = Booking(
@@ -209,15 +218,15 @@ class TestBookingModel:
             delivery_date=date(2025, 11, 5),
             pickup_date=date(2025, 11, 7),
             delivery_address="456 Test Ave",
-            subtotal=Decimal("300.00"),
-            delivery_fee=Decimal("50.00"),
-            tip=Decimal("0.00"),
-            total=Decimal("350.00"),
+            subtotal=_D["300.00"],
+            delivery_fee=_D["50.00"],
+            tip=_D["0.00"],
+            total=_D["350.00"],
             status=BookingStatus.PENDING,
             payment_status=PaymentStatus.PENDING
         )
         db.add(booking2)
-        db.commit()
+        db.flush()
         db.refresh(booking2)
 
         assert booking1.order_number != booking2.order_number
@@ -229,16 +238,16 @@ class TestBookingModel:
             delivery_date=date(2025, 11, 1),
             pickup_date=date(2025, 11, 3),
             delivery_address="123 Test St",
-            subtotal=Decimal("250.00"),
-            delivery_fee=Decimal("50.00"),
-            tip=Decimal("0.00"),
-            total=Decimal("300.00"),
+            subtotal=_D["250.00"],
+            delivery_fee=_D["50.00"],
+            tip=_D["0.00"],
+            total=_D["300.00"],
             status=BookingStatus.PENDING,
             payment_status=PaymentStatus.PENDING
         )
         db.add(booking)
         with pytest.raises(IntegrityError):
-            db.commit()
+            db.flush()
 
 
 class TestBookingItemModel:
@@ -250,15 +259,15 @@ class TestBookingItemModel:
             booking_id=sample_booking.booking_id,
             inventory_item_id=sample_inventory_item.inventory_item_id,
             quantity=2,
-            price=Decimal("250.00")
+            price=_D["250.00"]
         )
         db.add(booking_item)
-        db.commit()
+        db.flush()
         db.refresh(booking_item)
 
         assert booking_item.booking_item_id is not None
         assert booking_item.quantity == 2
-        assert booking_item.price == Decimal("250.00")
+        assert booking_item.price == _D["250.00"]
 
     def test_booking_item_requires_booking(self, db, sample_inventory_item):
         """Test that booking item requires valid booking."""
@@ -266,19 +275,26 @@ class TestBookingItemModel:
             booking_id="nonexistent-booking-id",
             inventory_item_id=sample_inventory_item.inventory_item_id,
             quantity=1,
-            price=Decimal("250.00")
+            price=_D["250.00"]
         )
         db.add(booking_item)
         with pytest.raises(IntegrityError):
-            db.commit()
+            db.flush()
 
 
 class TestModelRelationships:
-    """Test relationships between models."""
+    """
+    Test relationships between models.
+
+    Queries eager-load only the relationship under test and raise on any
+    other lazy load, so accidental N+1 access fails loudly.
+    """
 
     def test_customer_bookings_relationship(self, db, sample_customer, sample_booking):
         """Test that customer has access to their bookings."""
-        customer = db.query(Customer).filter(
+        customer = db.query(Customer).options(
+            selectinload(Customer.bookings), raiseload("*")
+        ).filter(
             Customer.customer_id == sample_customer.customer_id
         ).first()
         assert len(customer.bookings) >= 1
@@ -286,15 +302,19 @@ class TestModelRelationships:
 
     def test_booking_items_relationship(self, db, sample_booking):
         """Test that booking has access to its items."""
-        booking = db.query(Booking).filter(
+        booking = db.query(Booking).options(
+            selectinload(Booking.booking_items), raiseload("*")
+        ).filter(
             Booking.booking_id == sample_booking.booking_id
         ).first()
         assert len(booking.booking_items) >= 1
 
     def test_driver_bookings_relationship(self, db, sample_driver, sample_booking):
         """Test that driver has access to assigned bookings."""
-        driver = db.query(Driver).filter(
+        driver = db.query(Driver).options(
+            selectinload(Driver.deliveries), raiseload("*")
+        ).filter(
             Driver.driver_id == sample_driver.driver_id
         ).first()
-        assert len(driver.assigned_deliveries) >= 1
-        assert any(b.booking_id == sample_booking.booking_id for b in driver.assigned_deliveries)
+        assert len(driver.deliveries) >= 1
+        assert any(b.booking_id == sample_booking.booking_id for b in driver.deliveries)
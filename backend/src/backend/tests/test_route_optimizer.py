@@ -0,0 +1,339 @@
+"""
+Unit tests for the route optimizer behind driver recommendations.
+
+Every stop carries coordinates, so nothing here geocodes.
+"""
+
+import random
+from datetime import time
+from itertools import permutations
+
+import pytest
+
+from services.geocoding import fast_distance_miles, haversine_distance_miles
+from services.driver_route import DriverRoute, Stop
+from services.route_optimizer import build_driver_route, has_time_conflict, recommend_drivers
+from services.route_refinement import (
+    distance_lower_bound,
+    refined_route_disruption,
+    two_opt_refine,
+)
+
+
+def _random_fixture(seed):
+    """Build random drivers, bookings and a new booking around Costa Mesa."""
+    rng = random.Random(seed)
+    dates = ["2025-10-25", "2025-10-26"]
+
+    drivers = [
+        {"id": i, "name": f"Driver {i}", "is_active": rng.random() > 0.1}
+        for i in range(rng.randint(1, 30))
+    ]
+    driver_ids = [None] + [driver["id"] for driver in drivers]
+
+    bookings = []
+    for i in range(rng.randint(0, 200)):
+        # Mostly local stops, with the odd one much further out
+        spread = 0.5 if rng.random() > 0.05 else 5.0
+        bookings.append({
+            "id": i,
+            "delivery_address": f"{i} Harbor Blvd",
+            "delivery_date": rng.choice(dates),
+            "pickup_date": rng.choice(dates),
+            "delivery_lat": 33.4 + rng.random() * spread,
+            "delivery_lng": -118.1 + rng.random() * spread,
+            "delivery_driver_id": rng.choice(driver_ids),
+            "pickup_driver_id": rng.choice(driver_ids),
+        })
+
+    new_booking = {
+        "id": "new",
+        "delivery_address": "1 New St",
+        "delivery_date": rng.choice(dates),
+        "pickup_date": dates[1],
+        "delivery_lat": 33.6 + rng.random() * 0.2,
+        "delivery_lng": -117.95 + rng.random() * 0.2,
+    }
+    return drivers, bookings, new_booking, rng.randint(1, 8)
+
+
+def _route(stops):
+    """Build a route from (lat, lon) pairs, all with whole-day windows."""
+    route = DriverRoute(1, "Driver 1", "2025-10-25")
+    for i, coords in enumerate(stops):
+        route.add_stop(Stop(f"{i} Main St", (time(9, 0), time(17, 0)), "delivery", i, coords))
+    return route
+
+
+class TestPruning:
+    """Tests that pruning drivers by their lower bound never changes results."""
+
+    @pytest.mark.parametrize("seed", range(50))
+    @pytest.mark.parametrize("refine_routes", [False, True])
+    def test_pruned_matches_unpruned(self, seed, refine_routes):
+        """Test that the top recommendations are the same with and without pruning."""
+        drivers, bookings, new_booking, limit = _random_fixture(seed)
+
+        pruned = recommend_drivers(
+            drivers, bookings, new_booking, limit, refine_routes=refine_routes
+        )
+        unpruned = recommend_drivers(
+            drivers, bookings, new_booking, limit, refine_routes=refine_routes, prune=False
+        )
+
+        assert pruned == unpruned
+
+    @pytest.mark.parametrize("seed", range(200))
+    def test_lower_bound_never_exceeds_distance(self, seed):
+        """Test that the lower bound is at most the distance to the closest stop."""
+        rng = random.Random(seed)
+        spread = rng.choice([0.01, 0.5, 5.0, 40.0])
+        stops = [
+            (rng.uniform(-60, 60), rng.uniform(-170, 170))
+            for _ in range(rng.randint(1, 8))
+        ]
+        # Keep most routes local, like real ones
+        if spread < 40.0:
+            lat, lon = stops[0]
+            stops = [
+                (lat + rng.random() * spread, lon + rng.random() * spread)
+                for _ in stops
+            ]
+        route = _route(stops)
+        target = (
+            max(-89.0, min(89.0, stops[0][0] + rng.uniform(-2, 2) * spread)),
+            stops[0][1] + rng.uniform(-2, 2) * spread,
+        )
+
+        # Ranking measures with fast_distance_miles, which can come in just
+        # under the haversine, so the bound must hold against both
+        closest = min(
+            min(haversine_distance_miles(*stop, *target), fast_distance_miles(*stop, *target))
+            for stop in stops
+        )
+
+        assert distance_lower_bound(route, target) <= closest
+
+    def test_lower_bound_inside_bounding_box(self):
+        """Test that a target inside the route's bounding box has a zero bound."""
+        route = _route([(33.60, -117.95), (33.70, -117.85)])
+
+        assert distance_lower_bound(route, (33.65, -117.90)) == 0.0
+
+    def test_lower_bound_without_geocoded_stops(self):
+        """Test that a route with no coordinates can't be pruned."""
+        assert distance_lower_bound(DriverRoute(1, "Driver 1", "2025-10-25"), (33.6, -117.9)) == 0.0
+
+
+def _random_window(rng):
+    """A window on the hour between 8:00 and 18:00, so ends often touch starts."""
+    start = rng.randint(8, 17)
+    return time(start, 0), time(rng.randint(start + 1, 18), 0)
+
+
+def _overlaps_brute_force(windows, window):
+    """Check a window against every other one; touching windows don't overlap."""
+    start, end = window
+    return any(s < end and start < e for s, e in windows)
+
+
+def _windows_route(windows):
+    """Build a route with one stop per time window, in the given order."""
+    route = DriverRoute(1, "Driver 1", "2025-10-25")
+    for i, window in enumerate(windows):
+        route.add_stop(Stop(f"{i} Main St", window, "delivery", i, (33.6, -117.9)))
+    return route
+
+
+class TestTimeConflicts:
+    """Tests for the sorted time window overlap check."""
+
+    @pytest.mark.parametrize("seed", range(300))
+    def test_matches_brute_force(self, seed):
+        """Test overlaps against a scan of every window, inserting in random order."""
+        rng = random.Random(seed)
+        route = DriverRoute(1, "Driver 1", "2025-10-25")
+        windows = []
+        for i in range(rng.randint(0, 7)):
+            window = _random_window(rng)
+            # Insert at any position, so windows don't arrive sorted
+            route.insert_stop(
+                rng.randint(0, len(route.stops)),
+                Stop(f"{i} Main St", window, "delivery", i, (33.6, -117.9)),
+            )
+            windows.append(window)
+
+        for _ in range(20):
+            window = _random_window(rng)
+            expected = _overlaps_brute_force(windows, window)
+            assert route.overlaps(window) == expected
+            assert has_time_conflict(route, "2025-10-25", "2025-10-27", window) == expected
+
+    def test_touching_windows_do_not_overlap(self):
+        """Test that a window starting as another ends, or ending as it starts, is free."""
+        route = _windows_route([(time(10, 0), time(12, 0))])
+
+        assert not route.overlaps((time(12, 0), time(14, 0)))
+        assert not route.overlaps((time(8, 0), time(10, 0)))
+        assert route.overlaps((time(11, 59), time(14, 0)))
+
+    def test_nested_windows(self):
+        """Test windows inside and around an existing one."""
+        route = _windows_route([(time(9, 0), time(17, 0)), (time(10, 0), time(11, 0))])
+
+        assert route.overlaps((time(12, 0), time(13, 0)))
+        assert route.overlaps((time(8, 0), time(18, 0)))
+        assert not route.overlaps((time(17, 0), time(18, 0)))
+
+    def test_long_early_window_found_behind_later_starts(self):
+        """Test that an early window running late is found past shorter later ones."""
+        route = _windows_route([
+            (time(13, 0), time(14, 0)),
+            (time(8, 0), time(17, 0)),
+            (time(10, 0), time(11, 0)),
+        ])
+
+        assert route.overlaps((time(15, 0), time(16, 0)))
+        assert not route.overlaps((time(17, 0), time(18, 0)))
+
+    def test_other_dates_never_conflict(self):
+        """Test that routes on another date don't conflict."""
+        route = _windows_route([(time(9, 0), time(17, 0))])
+
+        assert not has_time_conflict(route, "2025-10-26", "2025-10-27", (time(9, 0), time(17, 0)))
+
+
+def _path_miles(stops):
+    """Length in miles of visiting (lat, lon) stops in order."""
+    return sum(fast_distance_miles(*a, *b) for a, b in zip(stops, stops[1:]))
+
+
+class TestTwoOpt:
+    """Tests for 2-opt route refinement."""
+
+    @pytest.mark.parametrize("seed", range(200))
+    def test_refinement_is_a_shorter_reordering(self, seed):
+        """
+        Test that 2-opt keeps every stop and the first one first, and never
+        lengthens the route.
+        """
+        rng = random.Random(seed)
+        stops = [
+            (33.5 + rng.random() * 0.3, -118.0 + rng.random() * 0.3)
+            for _ in range(rng.randint(1, 9))
+        ]
+        lats = [lat for lat, _ in stops]
+        lons = [lon for _, lon in stops]
+
+        order = two_opt_refine(lats, lons)
+
+        assert sorted(order) == list(range(len(stops)))
+        assert order[0] == 0
+        assert _path_miles([stops[i] for i in order]) <= _path_miles(stops) + 1e-9
+
+    def test_uncrosses_route(self):
+        """Test that a route crossing itself is reordered to follow the square's sides."""
+        # Corners of a square, visited A -> C -> B -> D: both diagonals cross
+        lats = [33.60, 33.61, 33.60, 33.61]
+        lons = [-117.90, -117.89, -117.89, -117.90]
+
+        assert two_opt_refine(lats, lons) == [0, 2, 1, 3]
+
+    def test_optimal_route_unchanged(self):
+        """Test that a route along a straight line is left alone."""
+        lats = [33.60, 33.61, 33.62, 33.63]
+        lons = [-117.90] * 4
+
+        assert two_opt_refine(lats, lons) == [0, 1, 2, 3]
+
+    @pytest.mark.parametrize("seed", range(100))
+    def test_refined_disruption_against_optimal_routes(self, seed):
+        """Test refined disruption on optimal routes against brute-force tours."""
+        rng = random.Random(seed)
+        first, *rest = [
+            (33.5 + rng.random() * 0.3, -118.0 + rng.random() * 0.3)
+            for _ in range(rng.randint(1, 6))
+        ]
+        new = (33.5 + rng.random() * 0.3, -118.0 + rng.random() * 0.3)
+        # Start from the best order, which 2-opt can't shorten
+        stops = [first, *min(permutations(rest), key=lambda order: _path_miles([first, *order]))]
+        optimal_without = _path_miles(stops)
+        optimal_with = min(
+            _path_miles([first, *order]) for order in permutations([*rest, new])
+        )
+        inserted = min(
+            _path_miles(stops[:i] + [new] + stops[i:]) for i in range(1, len(stops) + 1)
+        )
+
+        disruption = refined_route_disruption(_route(stops), new)
+
+        # No better than the optimal tour, no worse than the best insertion
+        assert disruption >= optimal_with - optimal_without - 1e-9
+        assert disruption <= inserted - optimal_without + 1e-9
+
+    def test_refined_disruption_for_stop_on_the_way(self):
+        """Test that a stop on the straight line between two stops adds almost nothing."""
+        route = _route([(33.60, -117.90), (33.62, -117.90)])
+
+        assert refined_route_disruption(route, (33.61, -117.90)) == pytest.approx(0.0, abs=1e-6)
+
+    def test_refined_disruption_for_empty_route(self):
+        """Test that a driver with no stops has no disruption."""
+        route = DriverRoute(1, "Driver 1", "2025-10-25")
+
+        assert refined_route_disruption(route, (33.6, -117.9)) == 0.0
+
+
+class TestGeocodingFallback:
+    """Tests that addresses the batch geocoder couldn't resolve aren't retried."""
+
+    def test_failed_addresses_not_geocoded_again(self, monkeypatch):
+        """Test that a stop whose batch lookup failed is left without coordinates."""
+        def fail_geocode(address):
+            raise AssertionError(f"Unexpected geocoding of {address!r}")
+
+        monkeypatch.setattr("services.driver_route.geocode_address", fail_geocode)
+        driver = {"id": 1, "name": "Driver 1"}
+        stops = [
+            ("delivery", {"id": 1, "delivery_address": "Nowhere Rd"}),
+            ("pickup", {"id": 2, "delivery_address": "1 Main St",
+                        "delivery_lat": 33.64, "delivery_lng": -117.92}),
+        ]
+
+        route = build_driver_route(
+            driver,
+            driver_stops=stops,
+            date="2025-10-25",
+            coords_by_address={"Nowhere Rd": None},
+        )
+
+        assert route.lats == (None, 33.64)
+        assert route.lons == (None, -117.92)
+
+
+class TestBuildDriverRoute:
+    """Tests for building and caching driver routes."""
+
+    def test_stops_are_keyword_only(self):
+        """Test that the old positional call fails instead of misreading its arguments."""
+        with pytest.raises(TypeError):
+            build_driver_route({"id": 1, "name": "Driver 1"}, [], "2025-10-25", {})
+
+    def test_cached_route_is_frozen(self):
+        """Test that a route shared through the cache can't be changed."""
+        stops = [("delivery", {"id": 1, "delivery_address": "1 Main St",
+                               "delivery_lat": 33.64, "delivery_lng": -117.92})]
+        route = build_driver_route(
+            {"id": 1, "name": "Driver 1"},
+            driver_stops=stops,
+            date="2025-10-25",
+            coords_by_address={},
+        )
+
+        new_stop = Stop("2 Main St", (time(9, 0), time(17, 0)), "pickup", 2, (33.6, -117.9))
+
+        with pytest.raises(AttributeError):
+            route.add_stop(new_stop)
+        with pytest.raises(AttributeError):
+            route.bbox = None
+        assert len(route.stops) == 1
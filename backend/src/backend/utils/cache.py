@@ -4,11 +4,81 @@ Simple in-memory cache with TTL support.
 Provides a lightweight caching solution without external dependencies.
 """
 
-from datetime import datetime, timedelta, UTC
+from dataclasses import dataclass, field
+from heapq import heappop, heappush
+from time import monotonic
 from typing import Any, Optional
 import threading
 
 
+# Number of independently locked shards; must be a power of two
+SHARD_COUNT = 16
+
+
+@dataclass(slots=True, frozen=True)
+class Entry:
+    """
+    A cached value and the time it expires.
+
+    Entries are immutable; updating a key stores a new Entry, so lock-free
+    readers never see a half-updated value.
+    """
+
+    value: Any
+    expires_at: float  # time.monotonic() value
+
+
+@dataclass(slots=True)
+class _Shard:
+    """One slice of the cache with its own entries, expiry heap and lock."""
+
+    # namespace -> {full key -> Entry}
+    namespaces: dict[str, dict[str, Entry]] = field(default_factory=dict)
+    # Min-heap of (expires_at, key); records for overwritten or deleted
+    # keys are skipped when popped
+    expiry_heap: list[tuple[float, str]] = field(default_factory=list)
+    lock: threading.Lock = field(default_factory=threading.Lock)
+
+
+def _namespace(key: str) -> str:
+    """
+    Get the namespace of a cache key.
+
+    Args:
+        key: Cache key such as "inventory:0:50"
+
+    Returns:
+        The part before the first ":" ("" if the key has no ":")
+    """
+    namespace, sep, _ = key.partition(":")
+    return namespace if sep else ""
+
+
+def _evict_expired(shard: _Shard, now: float) -> None:
+    """
+    Remove every entry in a shard that expired before now.
+
+    Pops only the expired head of the expiry heap, so the cost depends
+    on the number of expired records rather than the shard size.
+    Caller must hold the shard's lock.
+
+    Args:
+        shard: Shard to clean up
+        now: Current time.monotonic() value
+    """
+    heap = shard.expiry_heap
+    namespaces = shard.namespaces
+    while heap and heap[0][0] < now:
+        expires_at, key = heappop(heap)
+        bucket = namespaces.get(_namespace(key))
+        if bucket is None:
+            continue
+        entry = bucket.get(key)
+        # Ignore stale records for keys that were set again since
+        if entry is not None and entry.expires_at == expires_at:
+            del bucket[key]
+
+
 class InMemoryCache:
     """
     Thread-safe in-memory cache with TTL (time-to-live) support.
@@ -16,6 +86,13 @@ class InMemoryCache:
     Stores cache entries in memory with automatic expiration.
     Suitable for small to medium datasets that don't change frequently.
 
+    Entries are grouped by key namespace (the part before the first ":"),
+    so a whole namespace can be invalidated in one step.
+
+    Keys are spread over SHARD_COUNT shards by hash, each with its own
+    lock, so writers to different shards don't wait on each other. Reads
+    rely on CPython dict lookups being atomic and take no lock.
+
     Example:
         >>> cache = InMemoryCache(ttl_seconds=300)
         >>> cache.set("key1", {"data": "value"})
@@ -29,10 +106,13 @@ class InMemoryCache:
         Args:
             ttl_seconds: Time to live for cache entries in seconds (default: 300 = 5 minutes)
         """
-        self._cache: dict[str, dict[str, Any]] = {}
-        self._lock = threading.RLock()
+        self._shards = [_Shard() for _ in range(SHARD_COUNT)]
         self.ttl_seconds = ttl_seconds
 
+    def _shard(self, key: str) -> _Shard:
+        """Get the shard that owns a key."""
+        return self._shards[hash(key) & (SHARD_COUNT - 1)]
+
     def get(self, key: str) -> Optional[Any]:
         """
         Retrieve value from cache if it exists and hasn't expired.
@@ -43,19 +123,24 @@ class InMemoryCache:
         Returns:
             Cached value if exists and valid, None otherwise
         """
-        with self._lock:
-            if key not in self._cache:
-                return None
+        shard = self._shard(key)
+        bucket = shard.namespaces.get(_namespace(key))
+        if bucket is None:
+            return None
 
-            entry = self._cache[key]
-            expires_at = entry["expires_at"]
+        entry = bucket.get(key)
+        if entry is None:
+            return None
 
-            # Check if expired
-            if datetime.now(UTC) > expires_at:
-                del self._cache[key]
-                return None
+        # Check if expired
+        if monotonic() > entry.expires_at:
+            with shard.lock:
+                # Only evict if no one has replaced the entry in the meantime
+                if bucket.get(key) is entry:
+                    del bucket[key]
+            return None
 
-            return entry["value"]
+        return entry.value
 
     def set(self, key: str, value: Any, ttl_seconds: Optional[int] = None) -> None:
         """
@@ -67,10 +152,18 @@ class InMemoryCache:
             ttl_seconds: Custom TTL in seconds (uses default if not provided)
         """
         ttl = ttl_seconds if ttl_seconds is not None else self.ttl_seconds
-        expires_at = datetime.now(UTC) + timedelta(seconds=ttl)
-
-        with self._lock:
-            self._cache[key] = {"value": value, "expires_at": expires_at}
+        namespace = _namespace(key)
+        shard = self._shard(key)
+
+        with shard.lock:
+            now = monotonic()
+            expires_at = now + ttl
+            bucket = shard.namespaces.get(namespace)
+            if bucket is None:
+                bucket = shard.namespaces[namespace] = {}
+            bucket[key] = Entry(value, expires_at)
+            heappush(shard.expiry_heap, (expires_at, key))
+            _evict_expired(shard, now)
 
     def delete(self, key: str) -> None:
         """
@@ -79,28 +172,45 @@ class InMemoryCache:
         Args:
             key: Cache key to remove
         """
-        with self._lock:
-            self._cache.pop(key, None)
+        shard = self._shard(key)
+        with shard.lock:
+            bucket = shard.namespaces.get(_namespace(key))
+            if bucket is not None:
+                bucket.pop(key, None)
 
     def clear(self) -> None:
         """Clear all cache entries."""
-        with self._lock:
-            self._cache.clear()
+        for shard in self._shards:
+            with shard.lock:
+                shard.namespaces.clear()
+                shard.expiry_heap.clear()
 
     def clear_pattern(self, pattern: str) -> None:
         """
         Clear cache entries matching a pattern.
 
+        A pattern of the form "namespace:" drops that whole namespace at
+        once. Any other pattern is matched as a substring against every key.
+
         Args:
-            pattern: String pattern to match (simple substring match)
+            pattern: Namespace prefix ("inventory:") or substring to match
 
         Example:
             >>> cache.clear_pattern("inventory:")  # Clears all inventory cache keys
         """
-        with self._lock:
-            keys_to_delete = [key for key in self._cache if pattern in key]
-            for key in keys_to_delete:
-                del self._cache[key]
+        namespace, sep, rest = pattern.partition(":")
+        whole_namespace = bool(namespace and sep and not rest)
+
+        for shard in self._shards:
+            with shard.lock:
+                if whole_namespace:
+                    shard.namespaces.pop(namespace, None)
+                    continue
+
+                for bucket in shard.namespaces.values():
+                    keys_to_delete = [key for key in bucket if pattern in key]
+                    for key in keys_to_delete:
+                        del bucket[key]
 
     def get_stats(self) -> dict[str, Any]:
         """
@@ -109,22 +219,20 @@ class InMemoryCache:
         Returns:
             Dictionary with cache stats (size, ttl, entry count)
         """
-        with self._lock:
-            # Clean up expired entries first
-            now = datetime.now(UTC)
-            expired_keys = [
-                key
-                for key, entry in self._cache.items()
-                if now > entry["expires_at"]
-            ]
-            for key in expired_keys:
-                del self._cache[key]
-
-            return {
-                "entry_count": len(self._cache),
-                "ttl_seconds": self.ttl_seconds,
-                "keys": list(self._cache.keys()),
-            }
+        now = monotonic()
+        keys = []
+        for shard in self._shards:
+            with shard.lock:
+                # Clean up expired entries first
+                _evict_expired(shard, now)
+                for bucket in shard.namespaces.values():
+                    keys.extend(bucket)
+
+        return {
+            "entry_count": len(keys),
+            "ttl_seconds": self.ttl_seconds,
+            "keys": keys,
+        }
 
 
 # Global cache instance for inventory
@@ -18,9 +18,11 @@ Usage:
 
 import sys
 import os
-from typing import Dict, List, Set
-from sqlalchemy import create_engine, inspect
-from sqlalchemy.engine import Inspector
+from functools import cache
+from types import MappingProxyType
+from typing import Dict, List, Mapping, Set
+from sqlalchemy import create_engine, inspect, text
+from sqlalchemy.engine import Engine, Inspector
 
 # Add backend to path
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
@@ -28,20 +30,23 @@ sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
 from backend.database.models import Base
 
 
-def get_model_columns(model) -> Dict[str, str]:
+@cache
+def get_model_columns(model) -> Mapping[str, str]:
     """
     Extract column definitions from SQLAlchemy model.
 
+    Model metadata doesn't change at runtime, so the result is computed
+    once per model and shared as a read-only mapping.
+
     Args:
         model: SQLAlchemy model class
 
     Returns:
-        Dictionary mapping column names to their type strings
+        Mapping of column names to their type strings
     """
-    columns = {}
-    for col in model.__table__.columns:
-        columns[col.name] = str(col.type)
-    return columns
+    return MappingProxyType(
+        {col.name: str(col.type) for col in model.__table__.columns}
+    )
 
 
 def get_database_columns(inspector: Inspector, table_name: str) -> Dict[str, str]:
@@ -63,8 +68,55 @@ def get_database_columns(inspector: Inspector, table_name: str) -> Dict[str, str
         return {}
 
 
+# One round trip for every table instead of one reflection query per table
+POSTGRES_COLUMNS_QUERY = text(
+    """
+    SELECT table_name, column_name, data_type, udt_name
+    FROM information_schema.columns
+    WHERE table_schema = current_schema() AND table_name = ANY(:tables)
+    """
+)
+
+
+def get_all_database_columns(
+    engine: Engine, table_names: List[str]
+) -> Dict[str, Dict[str, str]]:
+    """
+    Extract columns for many database tables at once.
+
+    On PostgreSQL this issues a single information_schema.columns query.
+    Other databases fall back to inspecting each table individually.
+
+    Args:
+        engine: SQLAlchemy engine for the database to inspect
+        table_names: Names of the tables to inspect
+
+    Returns:
+        Dictionary mapping table names to {column name: type string}.
+        Tables that don't exist in the database are left out.
+    """
+    if engine.dialect.name != "postgresql":
+        inspector = inspect(engine)
+        columns_by_table = {}
+        for table_name in table_names:
+            db_columns = get_database_columns(inspector, table_name)
+            if db_columns:
+                columns_by_table[table_name] = db_columns
+        return columns_by_table
+
+    columns_by_table: Dict[str, Dict[str, str]] = {}
+    with engine.connect() as conn:
+        rows = conn.execute(POSTGRES_COLUMNS_QUERY, {"tables": list(table_names)})
+        for table_name, column_name, data_type, udt_name in rows:
+            # Enums and arrays report a generic data_type; udt_name has the real one
+            if data_type in ("USER-DEFINED", "ARRAY"):
+                data_type = udt_name
+            columns_by_table.setdefault(table_name, {})[column_name] = data_type
+    return columns_by_table
+
+
 def find_missing_columns(
-    model_columns: Dict[str, str], db_columns: Dict[str, str]
+    model_columns: Mapping[str, str], db_columns: Dict[str, str]
 ) -> Set[str]:
     """
     Find columns that exist in model but not in database.
@@ -80,7 +132,7 @@ def find_missing_columns(
 
 
 def find_extra_columns(
-    model_columns: Dict[str, str], db_columns: Dict[str, str]
+    model_columns: Mapping[str, str], db_columns: Dict[str, str]
 ) -> Set[str]:
     """
     Find columns that exist in database but not in model.
@@ -113,19 +165,32 @@ def verify_schema(database_url: str) -> Dict[str, Dict[str, List[str]]]:
     """
     print(f"Connecting to database...")
     engine = create_engine(database_url)
-    inspector = inspect(engine)
 
     differences = {}
 
     # Get all tables from models
     print(f"\nChecking {len(Base.metadata.tables)} tables...")
 
+    # Get columns for every table from the database in one go
+    columns_by_table = get_all_database_columns(
+        engine, list(Base.metadata.tables)
+    )
+
+    models_by_table = {
+        mapper.local_table.name: mapper.class_ for mapper in Base.registry.mappers
+    }
+
     for table_name, table in Base.metadata.tables.items():
         # Get columns from model
-        model_columns = {col.name: str(col.type) for col in table.columns}
+        model = models_by_table.get(table_name)
+        if model is not None:
+            model_columns = get_model_columns(model)
+        else:
+            # Plain Table without a mapped class
+            model_columns = {col.name: str(col.type) for col in table.columns}
 
         # Get columns from database
-        db_columns = get_database_columns(inspector, table_name)
+        db_columns = columns_by_table.get(table_name, {})
 
         if not db_columns:
             # Table doesn't exist in database
@@ -154,6 +219,8 @@ def print_differences(differences: Dict[str, Dict[str, List[str]]]) -> None:
     """
     Pretty print schema differences.
 
+    The report is assembled first and written to stdout in one call.
+
     Args:
         differences: Schema differences from verify_schema()
     """
@@ -161,38 +228,44 @@ def print_differences(differences: Dict[str, Dict[str, List[str]]]) -> None:
         print("\n✅ Schema matches models perfectly!")
         return
 
-    print("\n" + "=" * 70)
-    print("❌ SCHEMA DIFFERENCES DETECTED")
-    print("=" * 70)
+    lines = [
+        "",
+        "=" * 70,
+        "❌ SCHEMA DIFFERENCES DETECTED",
+        "=" * 70,
+    ]
 
     for table_name, diff in differences.items():
-        print(f"\n📋 Table: {table_name}")
+        lines.append(f"\n📋 Table: {table_name}")
 
         if diff.get("table_missing"):
-            print(f"   ⚠️  TABLE DOES NOT EXIST IN DATABASE")
-            print(f"   Missing columns: {', '.join(diff['missing'])}")
+            lines.append(f"   ⚠️  TABLE DOES NOT EXIST IN DATABASE")
+            lines.append(f"   Missing columns: {', '.join(diff['missing'])}")
             continue
 
         if diff["missing"]:
-            print(f"   ❌ Missing columns in database:")
-            for col in diff["missing"]:
-                print(f"      - {col}")
+            lines.append(f"   ❌ Missing columns in database:")
+            lines.extend(f"      - {col}" for col in diff["missing"])
 
         if diff["extra"]:
-            print(f"   ⚠️  Extra columns in database (not in model):")
-            for col in diff["extra"]:
-                print(f"      - {col}")
-
-    print("\n" + "=" * 70)
-    print("RECOMMENDED ACTIONS:")
-    print("=" * 70)
-    print("1. Review the differences above")
-    print("2. Create a migration to add missing columns:")
-    print("   - Option A: Use Alembic: alembic revision --autogenerate")
-    print("   - Option B: Add to /api/admin/migrate-schema endpoint")
-    print("3. Test migration locally before applying to production")
-    print("4. Run migration: curl -X POST .../api/admin/migrate-schema")
-    print("=" * 70 + "\n")
+            lines.append(f"   ⚠️  Extra columns in database (not in model):")
+            lines.extend(f"      - {col}" for col in diff["extra"])
+
+    lines += [
+        "",
+        "=" * 70,
+        "RECOMMENDED ACTIONS:",
+        "=" * 70,
+        "1. Review the differences above",
+        "2. Create a migration to add missing columns:",
+        "   - Option A: Use Alembic: alembic revision --autogenerate",
+        "   - Option B: Add to /api/admin/migrate-schema endpoint",
+        "3. Test migration locally before applying to production",
+        "4. Run migration: curl -X POST .../api/admin/migrate-schema",
+        "=" * 70 + "\n",
+    ]
+
+    sys.stdout.write("\n".join(lines) + "\n")
 
 
 def generate_migration_sql(differences: Dict[str, Dict[str, List[str]]]) -> str:
@@ -0,0 +1,140 @@
+"""
+Stops and routes that driver recommendations are worked out from.
+"""
+
+from bisect import bisect_left, bisect_right
+from datetime import time
+from typing import List, Optional, Tuple
+
+from services.geocoding import geocode_address
+
+
+class Stop:
+    """Represents a stop on a driver's route."""
+
+    def __init__(
+        self,
+        address: str,
+        time_window: Tuple[time, time],
+        stop_type: str,
+        booking_id: int,
+        coords: Optional[Tuple[float, float]] = None,
+        geocode: bool = True,
+    ):
+        self.address = address
+        self.time_window = time_window
+        self.stop_type = stop_type  # 'delivery' or 'pickup'
+        self.booking_id = booking_id
+        # Without coordinates, the address is geocoded unless the caller
+        # has already tried and failed. geocode_address's provider caches
+        # already memoize lookups, so repeated addresses are cheap
+        if coords or not geocode:
+            self.coords = coords if coords else None
+        else:
+            self.coords = geocode_address(address) or None
+
+
+class DriverRoute:
+    """
+    Represents a driver's route for a given date.
+
+    Stop coordinates are also kept in parallel lists of lats and lons in
+    degrees (None for stops that couldn't be geocoded), so distance
+    calculations can work on whole routes at once.
+    """
+
+    def __init__(self, driver_id: int, driver_name: str, date: str):
+        self.driver_id = driver_id
+        self.driver_name = driver_name
+        self.date = date
+        self.stops: List[Stop] = []
+        self.lats: List[Optional[float]] = []
+        self.lons: List[Optional[float]] = []
+        # (lat_min, lat_max, lon_min, lon_max) of the geocoded stops
+        self.bbox: Optional[Tuple[float, float, float, float]] = None
+        # Stop time windows sorted by start, and the latest end among the
+        # first i + 1 of them, so overlap checks are a binary search
+        self.time_windows: List[Tuple[time, time]] = []
+        self._max_ends: List[time] = []
+        self._frozen = False
+
+    def __setattr__(self, name, value):
+        if getattr(self, "_frozen", False):
+            raise AttributeError(f"Route for driver {self.driver_id} is frozen")
+        super().__setattr__(name, value)
+
+    def freeze(self) -> None:
+        """
+        Make the route read-only.
+
+        The stop lists become tuples, and adding stops or setting
+        attributes raises AttributeError, so a route shared through a
+        cache can't be changed by one of its users.
+        """
+        self.stops = tuple(self.stops)
+        self.lats = tuple(self.lats)
+        self.lons = tuple(self.lons)
+        self.time_windows = tuple(self.time_windows)
+        self._max_ends = tuple(self._max_ends)
+        self._frozen = True
+
+    def add_stop(self, stop: Stop) -> None:
+        """Add a stop to the end of the route."""
+        self.insert_stop(len(self.stops), stop)
+
+    def insert_stop(self, index: int, stop: Stop) -> None:
+        """
+        Insert a stop before position index.
+
+        Args:
+            index: Position for the new stop (len(stops) appends)
+            stop: Stop to insert
+
+        Raises:
+            AttributeError: If the route is frozen
+        """
+        if self._frozen:
+            raise AttributeError(f"Route for driver {self.driver_id} is frozen")
+
+        self.stops.insert(index, stop)
+        lat, lon = stop.coords if stop.coords else (None, None)
+        self.lats.insert(index, lat)
+        self.lons.insert(index, lon)
+        if lat is not None:
+            if self.bbox is None:
+                self.bbox = (lat, lat, lon, lon)
+            else:
+                lat_min, lat_max, lon_min, lon_max = self.bbox
+                self.bbox = (
+                    min(lat_min, lat), max(lat_max, lat),
+                    min(lon_min, lon), max(lon_max, lon),
+                )
+
+        window_index = bisect_right(self.time_windows, stop.time_window)
+        self.time_windows.insert(window_index, stop.time_window)
+        # Only the running maximums from the new window on can change
+        max_end = self._max_ends[window_index - 1] if window_index else stop.time_window[1]
+        max_ends = self._max_ends[:window_index]
+        for _, end in self.time_windows[window_index:]:
+            max_end = max(max_end, end)
+            max_ends.append(max_end)
+        self._max_ends = max_ends
+
+    def overlaps(self, time_window: Tuple[time, time]) -> bool:
+        """
+        Check whether a time window overlaps any stop's window.
+
+        Windows that only touch (one ends as the other starts) don't
+        overlap.
+
+        Args:
+            time_window: (start, end) of the window to check
+
+        Returns:
+            True if some stop's window overlaps it
+        """
+        start, end = time_window
+        # Windows starting before the new one ends come first; one of them
+        # overlaps if the latest of their ends is after the new start
+        before_end = bisect_left(self.time_windows, (end,))
+        return before_end > 0 and self._max_ends[before_end - 1] > start
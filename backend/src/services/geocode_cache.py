@@ -0,0 +1,150 @@
+"""
+Persistent cache for geocoding results.
+
+Stores coordinates in a local SQLite file so they survive restarts and
+are shared by every worker process on the host, cutting repeat calls to
+the geocoding providers.
+
+Configured via environment variables:
+- GEOCODE_CACHE_PATH: SQLite file to use ("" disables the cache; default:
+  geocode_cache.db in the backend directory, whatever the working directory)
+- GEOCODE_CACHE_TTL: Seconds an entry stays valid (default: 48 hours)
+"""
+
+import os
+import sqlite3
+import threading
+import time
+import logging
+from functools import wraps
+from pathlib import Path
+from typing import Callable, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Configuration
+_BACKEND_DIR = Path(__file__).parent.parent.parent
+GEOCODE_CACHE_PATH = os.getenv("GEOCODE_CACHE_PATH", str(_BACKEND_DIR / "geocode_cache.db"))
+GEOCODE_CACHE_TTL = int(os.getenv("GEOCODE_CACHE_TTL", str(48 * 60 * 60)))
+
+_connection: Optional[sqlite3.Connection] = None
+_lock = threading.Lock()
+
+
+def normalize_address(address: str) -> str:
+    """
+    Normalize an address for use as a cache key.
+
+    Args:
+        address: Address as entered
+
+    Returns:
+        Lowercased address with runs of whitespace collapsed
+    """
+    return " ".join(address.lower().split())
+
+
+def _connect() -> Optional[sqlite3.Connection]:
+    """
+    Open the cache database on first use.
+
+    Caller must hold the lock.
+
+    Returns:
+        Shared connection, or None if the cache is disabled or unavailable
+    """
+    global _connection
+
+    if _connection is None and GEOCODE_CACHE_PATH:
+        try:
+            conn = sqlite3.connect(GEOCODE_CACHE_PATH, timeout=5, check_same_thread=False)
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS geocodes ("
+                "address TEXT PRIMARY KEY, lat REAL NOT NULL, lon REAL NOT NULL, "
+                "expires_at REAL NOT NULL)"
+            )
+            conn.commit()
+            _connection = conn
+        except sqlite3.Error as e:
+            logger.warning(f"Geocode cache unavailable at '{GEOCODE_CACHE_PATH}': {e}")
+
+    return _connection
+
+
+def get(address: str) -> Optional[Tuple[float, float]]:
+    """
+    Look up cached coordinates for an address.
+
+    Args:
+        address: Full address string
+
+    Returns:
+        Tuple of (latitude, longitude), or None if not cached or expired
+    """
+    with _lock:
+        conn = _connect()
+        if conn is None:
+            return None
+        try:
+            row = conn.execute(
+                "SELECT lat, lon FROM geocodes WHERE address = ? AND expires_at > ?",
+                (normalize_address(address), time.time()),
+            ).fetchone()
+        except sqlite3.Error as e:
+            logger.warning(f"Geocode cache read failed: {e}")
+            return None
+
+    return (row[0], row[1]) if row else None
+
+
+def put(address: str, lat: float, lon: float, ttl: int = GEOCODE_CACHE_TTL) -> None:
+    """
+    Cache coordinates for an address.
+
+    Args:
+        address: Full address string
+        lat: Latitude
+        lon: Longitude
+        ttl: Seconds until the entry expires
+    """
+    with _lock:
+        conn = _connect()
+        if conn is None:
+            return
+        try:
+            conn.execute(
+                "INSERT OR REPLACE INTO geocodes (address, lat, lon, expires_at) "
+                "VALUES (?, ?, ?, ?)",
+                (normalize_address(address), lat, lon, time.time() + ttl),
+            )
+            conn.commit()
+        except sqlite3.Error as e:
+            logger.warning(f"Geocode cache write failed: {e}")
+
+
+def cached(
+    geocoder: Callable[[str], Optional[Tuple[float, float]]]
+) -> Callable[[str], Optional[Tuple[float, float]]]:
+    """
+    Decorate a geocoder so it consults the persistent cache first.
+
+    Successful lookups are stored; failures are not, so they're retried.
+
+    Args:
+        geocoder: Function mapping an address to (latitude, longitude) or None
+
+    Returns:
+        Wrapped geocoder
+    """
+    @wraps(geocoder)
+    def wrapper(address: str) -> Optional[Tuple[float, float]]:
+        coords = get(address)
+        if coords is not None:
+            return coords
+
+        coords = geocoder(address)
+        if coords is not None:
+            put(address, *coords)
+        return coords
+
+    return wrapper
@@ -7,9 +7,16 @@ Easily switchable via environment variable.
 
 import os
 import requests
-from typing import Optional, Tuple
+from concurrent.futures import ThreadPoolExecutor
+from requests.adapters import HTTPAdapter
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Iterable, Optional, Tuple
 from functools import lru_cache
+from urllib3.util.retry import Retry
 import logging
+from math import radians, cos, sin, asin, sqrt, pi
+
+from services import geocode_cache
 
 logger = logging.getLogger(__name__)
 
@@ -18,6 +25,31 @@ GEOCODING_PROVIDER = os.getenv("GEOCODING_PROVIDER", "osm").lower()  # "here", "
 GOOGLE_MAPS_API_KEY = os.getenv("GOOGLE_MAPS_API_KEY", "")
 HERE_API_KEY = os.getenv("HERE_API_KEY", "")
 
+# Radius of earth in kilometers, and in miles with the km -> mi factor folded in
+EARTH_RADIUS_KM = 6371
+EARTH_RADIUS_MILES = EARTH_RADIUS_KM * 0.621371
+MILES_PER_DEGREE = EARTH_RADIUS_MILES * pi / 180
+# Largest latitude/longitude difference (degrees, ~70 miles) for which
+# fast_distance_miles uses the flat-earth approximation
+FAST_DISTANCE_MAX_DEGREES = 1.0
+# Concurrent lookups for batch geocoding. Nominatim's usage policy allows
+# at most one request at a time, so OSM defaults to serial lookups
+GEOCODING_MAX_WORKERS = int(
+    os.getenv("GEOCODING_MAX_WORKERS", "1" if GEOCODING_PROVIDER == "osm" else "8")
+)
+
+# Shared HTTP session so provider calls reuse keep-alive connections
+# instead of opening a new TCP + TLS connection per lookup
+_session = requests.Session()
+_session.mount(
+    "https://",
+    HTTPAdapter(
+        pool_connections=10,
+        pool_maxsize=50,
+        max_retries=Retry(total=2, backoff_factor=0.2),
+    ),
+)
+
 
 def haversine_distance(
     lat1: float, lon1: float, lat2: float, lon2: float
@@ -34,8 +66,6 @@ def haversine_distance(
     Returns:
         Distance in kilometers
     """
-    from math import radians, cos, sin, asin, sqrt
-
     # Convert decimal degrees to radians
     lon1, lat1, lon2, lat2 = map(radians, [lon1, lat1, lon2, lat2])
 
@@ -45,10 +75,7 @@ def haversine_distance(
     a = sin(dlat / 2) ** 2 + cos(lat1) * cos(lat2) * sin(dlon / 2) ** 2
     c = 2 * asin(sqrt(a))
 
-    # Radius of earth in kilometers
-    r = 6371
-
-    return c * r
+    return c * EARTH_RADIUS_KM
 
 
 def haversine_distance_miles(
@@ -66,90 +93,166 @@ def haversine_distance_miles(
     Returns:
         Distance in miles
     """
-    km = haversine_distance(lat1, lon1, lat2, lon2)
-    return km * 0.621371  # Convert km to miles
+    # Same formula as haversine_distance, inlined with the mile radius
+    lon1, lat1, lon2, lat2 = radians(lon1), radians(lat1), radians(lon2), radians(lat2)
+    a = sin((lat2 - lat1) / 2) ** 2 + cos(lat1) * cos(lat2) * sin((lon2 - lon1) / 2) ** 2
+    return 2 * EARTH_RADIUS_MILES * asin(sqrt(a))
 
 
-@lru_cache(maxsize=1000)
-def geocode_address_osm(address: str) -> Optional[Tuple[float, float]]:
+def fast_distance_miles(
+    lat1: float, lon1: float, lat2: float, lon2: float
+) -> float:
     """
-    Geocode an address using OpenStreetMap Nominatim (free).
+    Calculate distance in miles, approximating for nearby points.
+
+    Points less than FAST_DISTANCE_MAX_DEGREES apart in both latitude and
+    longitude use the equirectangular approximation, which needs a single
+    cos and is within 0.01% of the haversine at that range. Points further
+    apart fall back to haversine_distance_miles.
 
     Args:
-        address: Full address string
+        lat1: Latitude of first point
+        lon1: Longitude of first point
+        lat2: Latitude of second point
+        lon2: Longitude of second point
 
     Returns:
-        Tuple of (latitude, longitude) or None if geocoding fails
+        Distance in miles
     """
-    try:
-        # Nominatim requires a user agent
-        headers = {"User-Agent": "PartayRentalApp/1.0"}
+    dlat = lat2 - lat1
+    dlon = lon2 - lon1
+    if abs(dlat) < FAST_DISTANCE_MAX_DEGREES and abs(dlon) < FAST_DISTANCE_MAX_DEGREES:
+        x = dlon * cos(radians((lat1 + lat2) / 2))
+        return MILES_PER_DEGREE * sqrt(x * x + dlat * dlat)
 
-        url = "https://nominatim.openstreetmap.org/search"
-        params = {"q": address, "format": "json", "limit": 1}
+    return haversine_distance_miles(lat1, lon1, lat2, lon2)
 
-        response = requests.get(
-            url, params=params, headers=headers, timeout=5
-        )
-        response.raise_for_status()
 
-        results = response.json()
-        if results and len(results) > 0:
-            lat = float(results[0]["lat"])
-            lon = float(results[0]["lon"])
-            logger.info(f"Geocoded '{address}' to ({lat}, {lon})")
-            return (lat, lon)
+@dataclass(slots=True, frozen=True)
+class GeocodeRequest:
+    """An HTTP GET to a geocoding provider, independent of the client making it."""
+
+    provider: str
+    url: str
+    params: Dict[str, Any]
+    headers: Optional[Dict[str, str]] = None
+    timeout: float = 5
+
 
-        logger.warning(f"No geocoding results for address: {address}")
+def build_osm_request(address: str) -> Optional[GeocodeRequest]:
+    """Build the OpenStreetMap Nominatim request for an address."""
+    # Nominatim requires a user agent, and can be slow; a short timeout
+    # only causes retries that count against its rate limit
+    return GeocodeRequest(
+        provider="OSM",
+        url="https://nominatim.openstreetmap.org/search",
+        params={"q": address, "format": "json", "limit": 1},
+        headers={"User-Agent": "PartayRentalApp/1.0"},
+        timeout=15,
+    )
+
+
+def parse_osm_response(address: str, results: Any) -> Optional[Tuple[float, float]]:
+    """Get the coordinates from a Nominatim response, or None if there are none."""
+    if results:
+        lat = float(results[0]["lat"])
+        lon = float(results[0]["lon"])
+        logger.info(f"Geocoded '{address}' to ({lat}, {lon})")
+        return (lat, lon)
+
+    logger.warning(f"No geocoding results for address: {address}")
+    return None
+
+
+def build_google_request(address: str) -> Optional[GeocodeRequest]:
+    """Build the Google Maps request for an address, or None without an API key."""
+    if not GOOGLE_MAPS_API_KEY:
+        logger.error("Google Maps API key not configured")
         return None
 
-    except Exception as e:
-        logger.error(f"Geocoding failed for '{address}': {e}")
+    return GeocodeRequest(
+        provider="Google",
+        url="https://maps.googleapis.com/maps/api/geocode/json",
+        params={"address": address, "key": GOOGLE_MAPS_API_KEY},
+    )
+
+
+def parse_google_response(address: str, data: Any) -> Optional[Tuple[float, float]]:
+    """Get the coordinates from a Google Maps response, or None if there are none."""
+    if data["status"] == "OK" and data["results"]:
+        location = data["results"][0]["geometry"]["location"]
+        lat = location["lat"]
+        lon = location["lng"]
+        logger.info(f"Geocoded '{address}' to ({lat}, {lon}) via Google")
+        return (lat, lon)
+
+    logger.warning(f"Google geocoding failed: {data.get('status')}")
+    return None
+
+
+def build_here_request(address: str) -> Optional[GeocodeRequest]:
+    """Build the HERE request for an address, or None without an API key."""
+    if not HERE_API_KEY:
+        logger.error("HERE API key not configured")
         return None
 
+    return GeocodeRequest(
+        provider="HERE",
+        url="https://geocode.search.hereapi.com/v1/geocode",
+        params={"q": address, "apiKey": HERE_API_KEY, "limit": 1},
+    )
 
-@lru_cache(maxsize=1000)
-def geocode_address_google(address: str) -> Optional[Tuple[float, float]]:
+
+def parse_here_response(address: str, data: Any) -> Optional[Tuple[float, float]]:
+    """Get the coordinates from a HERE response, or None if there are none."""
+    if data.get("items"):
+        position = data["items"][0]["position"]
+        lat = position["lat"]
+        lon = position["lng"]
+        logger.info(f"Geocoded '{address}' to ({lat}, {lon}) via HERE")
+        return (lat, lon)
+
+    logger.warning(f"HERE geocoding returned no results for: {address}")
+    return None
+
+
+def _geocode(
+    address: str,
+    build_request: Callable[[str], Optional[GeocodeRequest]],
+    parse_response: Callable[[str, Any], Optional[Tuple[float, float]]],
+) -> Optional[Tuple[float, float]]:
     """
-    Geocode an address using Google Maps Geocoding API.
+    Geocode an address with one provider over the shared HTTP session.
 
     Args:
         address: Full address string
+        build_request: Builds the provider's request for the address
+        parse_response: Gets the coordinates from the decoded JSON response
 
     Returns:
         Tuple of (latitude, longitude) or None if geocoding fails
     """
-    if not GOOGLE_MAPS_API_KEY:
-        logger.error("Google Maps API key not configured")
+    request = build_request(address)
+    if request is None:
         return None
 
     try:
-        url = "https://maps.googleapis.com/maps/api/geocode/json"
-        params = {"address": address, "key": GOOGLE_MAPS_API_KEY}
-
-        response = requests.get(url, params=params, timeout=5)
+        response = _session.get(
+            request.url, params=request.params, headers=request.headers, timeout=request.timeout
+        )
         response.raise_for_status()
-
-        data = response.json()
-        if data["status"] == "OK" and data["results"]:
-            location = data["results"][0]["geometry"]["location"]
-            lat = location["lat"]
-            lon = location["lng"]
-            logger.info(f"Geocoded '{address}' to ({lat}, {lon}) via Google")
-            return (lat, lon)
-
-        logger.warning(f"Google geocoding failed: {data.get('status')}")
-        return None
+        return parse_response(address, response.json())
 
     except Exception as e:
-        logger.error(f"Google geocoding failed for '{address}': {e}")
+        logger.error(f"{request.provider} geocoding failed for '{address}': {e}")
         return None
 
 
 @lru_cache(maxsize=1000)
-def geocode_address_here(address: str) -> Optional[Tuple[float, float]]:
+@geocode_cache.cached
+def geocode_address_osm(address: str) -> Optional[Tuple[float, float]]:
     """
-    Geocode an address using HERE Geocoding API.
+    Geocode an address using OpenStreetMap Nominatim (free).
 
     Args:
         address: Full address string
@@ -157,31 +260,37 @@ def geocode_address_here(address: str) -> Optional[Tuple[float, float]]:
     Returns:
         Tuple of (latitude, longitude) or None if geocoding fails
     """
-    if not HERE_API_KEY:
-        logger.error("HERE API key not configured")
-        return None
+    return _geocode(address, build_osm_request, parse_osm_response)
 
-    try:
-        url = "https://geocode.search.hereapi.com/v1/geocode"
-        params = {"q": address, "apiKey": HERE_API_KEY, "limit": 1}
 
-        response = requests.get(url, params=params, timeout=5)
-        response.raise_for_status()
+@lru_cache(maxsize=1000)
+@geocode_cache.cached
+def geocode_address_google(address: str) -> Optional[Tuple[float, float]]:
+    """
+    Geocode an address using Google Maps Geocoding API.
 
-        data = response.json()
-        if data.get("items") and len(data["items"]) > 0:
-            position = data["items"][0]["position"]
-            lat = position["lat"]
-            lon = position["lng"]
-            logger.info(f"Geocoded '{address}' to ({lat}, {lon}) via HERE")
-            return (lat, lon)
+    Args:
+        address: Full address string
 
-        logger.warning(f"HERE geocoding returned no results for: {address}")
-        return None
+    Returns:
+        Tuple of (latitude, longitude) or None if geocoding fails
+    """
+    return _geocode(address, build_google_request, parse_google_response)
 
-    except Exception as e:
-        logger.error(f"HERE geocoding failed for '{address}': {e}")
-        return None
+
+@lru_cache(maxsize=1000)
+@geocode_cache.cached
+def geocode_address_here(address: str) -> Optional[Tuple[float, float]]:
+    """
+    Geocode an address using HERE Geocoding API.
+
+    Args:
+        address: Full address string
+
+    Returns:
+        Tuple of (latitude, longitude) or None if geocoding fails
+    """
+    return _geocode(address, build_here_request, parse_here_response)
 
 
 def geocode_address(address: str) -> Optional[Tuple[float, float]]:
@@ -205,6 +314,31 @@ def geocode_address(address: str) -> Optional[Tuple[float, float]]:
         return geocode_address_osm(address)
 
 
+def geocode_addresses(
+    addresses: Iterable[str],
+) -> Dict[str, Optional[Tuple[float, float]]]:
+    """
+    Geocode many addresses, looking each distinct address up only once.
+
+    Lookups run concurrently on up to GEOCODING_MAX_WORKERS threads.
+
+    Args:
+        addresses: Address strings (duplicates are allowed)
+
+    Returns:
+        Dictionary mapping each distinct address to its coordinates,
+        or None where geocoding failed
+    """
+    unique_addresses = list(dict.fromkeys(addresses))
+    if len(unique_addresses) <= 1:
+        return {address: geocode_address(address) for address in unique_addresses}
+
+    # Lookups are network-bound, so overlap them on a bounded thread pool
+    with ThreadPoolExecutor(max_workers=GEOCODING_MAX_WORKERS) as executor:
+        results = executor.map(geocode_address, unique_addresses)
+        return dict(zip(unique_addresses, results))
+
+
 def calculate_distance(
     address1: str, address2: str, unit: str = "miles"
 ) -> Optional[float]:
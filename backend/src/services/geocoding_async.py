@@ -0,0 +1,231 @@
+"""
+Async geocoding for use from async request handlers.
+
+Builds requests and parses responses with the provider helpers in
+services.geocoding, but makes its HTTP calls with a shared
+httpx.AsyncClient so lookups don't block the event loop, and batches of
+addresses are geocoded concurrently with asyncio.gather.
+
+Uses the same configuration (GEOCODING_PROVIDER, API keys,
+GEOCODING_MAX_WORKERS) and the same persistent geocode cache as the
+sync module.
+"""
+
+import asyncio
+import logging
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Iterable, Optional, Tuple
+
+import httpx
+
+from services import geocode_cache
+from services.geocoding import (
+    GEOCODING_MAX_WORKERS,
+    GEOCODING_PROVIDER,
+    GeocodeRequest,
+    build_google_request,
+    build_here_request,
+    build_osm_request,
+    haversine_distance,
+    haversine_distance_miles,
+    parse_google_response,
+    parse_here_response,
+    parse_osm_response,
+)
+
+logger = logging.getLogger(__name__)
+
+# Most recent successful lookups. Failures aren't kept, so they're
+# retried, as with the persistent geocode cache
+MEMO_SIZE = 1000
+_memo: "OrderedDict[str, Tuple[float, float]]" = OrderedDict()
+
+_client: Optional[httpx.AsyncClient] = None
+
+
+def _get_client() -> httpx.AsyncClient:
+    """Get the shared HTTP client, creating it on first use."""
+    global _client
+
+    if _client is None:
+        _client = httpx.AsyncClient(
+            limits=httpx.Limits(max_connections=20, max_keepalive_connections=20),
+            transport=httpx.AsyncHTTPTransport(retries=2),
+        )
+    return _client
+
+
+async def aclose() -> None:
+    """Close the shared HTTP client (call on application shutdown)."""
+    global _client
+
+    if _client is not None:
+        client, _client = _client, None
+        await client.aclose()
+
+
+async def _geocode(
+    address: str,
+    build_request: Callable[[str], Optional[GeocodeRequest]],
+    parse_response: Callable[[str, Any], Optional[Tuple[float, float]]],
+) -> Optional[Tuple[float, float]]:
+    """
+    Geocode an address with one provider over the shared async client.
+
+    Args:
+        address: Full address string
+        build_request: Builds the provider's request for the address
+        parse_response: Gets the coordinates from the decoded JSON response
+
+    Returns:
+        Tuple of (latitude, longitude) or None if geocoding fails
+    """
+    request = build_request(address)
+    if request is None:
+        return None
+
+    try:
+        response = await _get_client().get(
+            request.url, params=request.params, headers=request.headers, timeout=request.timeout
+        )
+        response.raise_for_status()
+        return parse_response(address, response.json())
+
+    except Exception as e:
+        logger.error(f"{request.provider} geocoding failed for '{address}': {e}")
+        return None
+
+
+async def geocode_address_osm_async(address: str) -> Optional[Tuple[float, float]]:
+    """
+    Geocode an address using OpenStreetMap Nominatim (free).
+
+    Args:
+        address: Full address string
+
+    Returns:
+        Tuple of (latitude, longitude) or None if geocoding fails
+    """
+    return await _geocode(address, build_osm_request, parse_osm_response)
+
+
+async def geocode_address_google_async(address: str) -> Optional[Tuple[float, float]]:
+    """
+    Geocode an address using Google Maps Geocoding API.
+
+    Args:
+        address: Full address string
+
+    Returns:
+        Tuple of (latitude, longitude) or None if geocoding fails
+    """
+    return await _geocode(address, build_google_request, parse_google_response)
+
+
+async def geocode_address_here_async(address: str) -> Optional[Tuple[float, float]]:
+    """
+    Geocode an address using HERE Geocoding API.
+
+    Args:
+        address: Full address string
+
+    Returns:
+        Tuple of (latitude, longitude) or None if geocoding fails
+    """
+    return await _geocode(address, build_here_request, parse_here_response)
+
+
+async def geocode_address_async(address: str) -> Optional[Tuple[float, float]]:
+    """
+    Geocode an address using configured provider.
+
+    Checks recent lookups and the persistent geocode cache before calling
+    the provider. The cache is SQLite, so it's read and written on a
+    worker thread to keep the event loop free.
+
+    Args:
+        address: Full address string
+
+    Returns:
+        Tuple of (latitude, longitude) or None if geocoding fails
+    """
+    if not address or not address.strip():
+        return None
+
+    if address in _memo:
+        _memo.move_to_end(address)
+        return _memo[address]
+
+    coords = await asyncio.to_thread(geocode_cache.get, address)
+    if coords is None:
+        if GEOCODING_PROVIDER == "here":
+            coords = await geocode_address_here_async(address)
+        elif GEOCODING_PROVIDER == "google":
+            coords = await geocode_address_google_async(address)
+        else:
+            coords = await geocode_address_osm_async(address)
+
+        if coords is None:
+            return None
+        await asyncio.to_thread(geocode_cache.put, address, *coords)
+
+    _memo[address] = coords
+    if len(_memo) > MEMO_SIZE:
+        _memo.popitem(last=False)
+    return coords
+
+
+async def geocode_addresses_async(
+    addresses: Iterable[str],
+) -> Dict[str, Optional[Tuple[float, float]]]:
+    """
+    Geocode many addresses concurrently, looking each distinct address up once.
+
+    At most GEOCODING_MAX_WORKERS lookups are in flight at a time.
+
+    Args:
+        addresses: Address strings (duplicates are allowed)
+
+    Returns:
+        Dictionary mapping each distinct address to its coordinates,
+        or None where geocoding failed
+    """
+    unique_addresses = list(dict.fromkeys(addresses))
+    semaphore = asyncio.Semaphore(GEOCODING_MAX_WORKERS)
+
+    async def lookup(address: str) -> Optional[Tuple[float, float]]:
+        async with semaphore:
+            return await geocode_address_async(address)
+
+    results = await asyncio.gather(*(lookup(address) for address in unique_addresses))
+    return dict(zip(unique_addresses, results))
+
+
+async def calculate_distance_async(
+    address1: str, address2: str, unit: str = "miles"
+) -> Optional[float]:
+    """
+    Calculate distance between two addresses.
+
+    Args:
+        address1: First address
+        address2: Second address
+        unit: "miles" or "km"
+
+    Returns:
+        Distance in specified unit, or None if geocoding fails
+    """
+    coords = await geocode_addresses_async([address1, address2])
+    coords1 = coords[address1]
+    coords2 = coords[address2]
+
+    if not coords1 or not coords2:
+        return None
+
+    lat1, lon1 = coords1
+    lat2, lon2 = coords2
+
+    if unit == "km":
+        return haversine_distance(lat1, lon1, lat2, lon2)
+    else:
+        return haversine_distance_miles(lat1, lon1, lat2, lon2)
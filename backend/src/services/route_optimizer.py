@@ -5,88 +5,42 @@ Analyzes driver routes and recommends optimal driver assignment
 based on existing route, proximity, and availability.
 """
 
+import asyncio
 import logging
+from collections import defaultdict
+from dataclasses import dataclass
+from functools import lru_cache
+from heapq import heappush, heapreplace
 from typing import List, Dict, Optional, Tuple
 from datetime import datetime, time
 
-from services.geocoding import geocode_address, haversine_distance_miles
+from services.driver_route import DriverRoute, Stop
+from services.geocoding import geocode_addresses
+from services.geocoding_async import geocode_addresses_async
+from services.route_refinement import (
+    distance_lower_bound,
+    rank_driver_route,
+    refined_route_disruption,
+)
 
 logger = logging.getLogger(__name__)
 
-
-class Stop:
-    """Represents a stop on a driver's route."""
-
-    def __init__(
-        self,
-        address: str,
-        time_window: Tuple[time, time],
-        stop_type: str,
-        booking_id: int,
-        coords: Optional[Tuple[float, float]] = None,
-    ):
-        self.address = address
-        self.time_window = time_window
-        self.stop_type = stop_type  # 'delivery' or 'pickup'
-        self.booking_id = booking_id
-        # Use provided coordinates if available, otherwise geocode
-        self.coords = coords if coords else geocode_address(address)
-
-
-class DriverRoute:
-    """Represents a driver's route for a given date."""
-
-    def __init__(self, driver_id: int, driver_name: str, date: str):
-        self.driver_id = driver_id
-        self.driver_name = driver_name
-        self.date = date
-        self.stops: List[Stop] = []
-        self.total_distance = 0.0
-
-    def add_stop(self, stop: Stop) -> None:
-        """Add a stop to the route."""
-        self.stops.append(stop)
-        self._recalculate_distance()
-
-    def _recalculate_distance(self) -> None:
-        """Calculate total route distance."""
-        if len(self.stops) < 2:
-            self.total_distance = 0.0
-            return
-
-        total = 0.0
-        for i in range(len(self.stops) - 1):
-            stop1 = self.stops[i]
-            stop2 = self.stops[i + 1]
-
-            if stop1.coords and stop2.coords:
-                lat1, lon1 = stop1.coords
-                lat2, lon2 = stop2.coords
-                total += haversine_distance_miles(lat1, lon1, lat2, lon2)
-
-        self.total_distance = total
+# Route cache keys store coordinates as integer multiples of 1/COORD_SCALE
+# degrees (about 1 meter)
+COORD_SCALE = 100_000
 
 
+@dataclass(slots=True, frozen=True)
 class DriverRecommendation:
     """Represents a driver recommendation with score and reasoning."""
 
-    def __init__(
-        self,
-        driver_id: int,
-        driver_name: str,
-        score: float,
-        distance_to_delivery: float,
-        route_disruption: float,
-        current_stops: int,
-        reason: str,
-    ):
-        self.driver_id = driver_id
-        self.driver_name = driver_name
-        self.score = score
-        self.distance_to_delivery = distance_to_delivery
-        self.route_disruption = route_disruption
-        self.current_stops = current_stops
-        self.reason = reason
+    driver_id: int
+    driver_name: str
+    score: float
+    distance_to_delivery: float
+    route_disruption: float
+    current_stops: int
+    reason: str
 
     def to_dict(self) -> Dict:
         """Convert to dictionary for JSON serialization."""
@@ -101,166 +55,160 @@ class DriverRecommendation:
         }
 
 
-def build_driver_route(
-    driver: Dict, bookings: List[Dict], date: str
-) -> DriverRoute:
+def index_stops_by_driver(
+    bookings: List[Dict], date: str
+) -> Dict[int, List[Tuple[str, Dict]]]:
     """
-    Build a driver's route for a specific date.
+    Group the stops on a date by assigned driver in one pass over bookings.
 
     Args:
-        driver: Driver object with id and name
         bookings: List of all bookings
         date: Date string (YYYY-MM-DD)
 
     Returns:
-        DriverRoute object with all stops
+        Dictionary mapping driver id to that driver's (stop type, booking)
+        pairs, in booking order with a delivery before its pickup
     """
-    route = DriverRoute(driver["id"], driver["name"], date)
+    stops_by_driver = defaultdict(list)
 
     for booking in bookings:
-        # Get coordinates from booking if available
-        coords = None
-        if booking.get("delivery_lat") and booking.get("delivery_lng"):
-            coords = (booking["delivery_lat"], booking["delivery_lng"])
-
-        # Add delivery stop if driver is assigned and date matches
-        if (
-            booking.get("delivery_driver_id") == driver["id"]
-            and booking.get("delivery_date") == date
-        ):
-            # Create time window for delivery (assume 2-hour window)
-            # In production, use actual time slots from booking
-            stop = Stop(
-                address=booking["delivery_address"],
-                time_window=(time(9, 0), time(17, 0)),
-                stop_type="delivery",
-                booking_id=booking["id"],
-                coords=coords,
+        if booking.get("delivery_date") == date:
+            stops_by_driver[booking.get("delivery_driver_id")].append(
+                ("delivery", booking)
             )
-            route.add_stop(stop)
-
-        # Add pickup stop if driver is assigned and date matches
-        if (
-            booking.get("pickup_driver_id") == driver["id"]
-            and booking.get("pickup_date") == date
-        ):
-            stop = Stop(
-                address=booking["delivery_address"],
-                time_window=(time(9, 0), time(17, 0)),
-                stop_type="pickup",
-                booking_id=booking["id"],
-                coords=coords,
+        if booking.get("pickup_date") == date:
+            stops_by_driver[booking.get("pickup_driver_id")].append(
+                ("pickup", booking)
             )
-            route.add_stop(stop)
 
-    return route
+    return stops_by_driver
 
 
-def calculate_route_disruption(
-    route: DriverRoute, new_address: str, new_coords: Optional[Tuple[float, float]] = None
-) -> float:
+def build_driver_route(
+    driver: Dict,
+    *,
+    driver_stops: List[Tuple[str, Dict]],
+    date: str,
+    coords_by_address: Optional[Dict[str, Optional[Tuple[float, float]]]] = None,
+) -> DriverRoute:
     """
-    Calculate how much adding a new stop disrupts the driver's route.
+    Build a driver's route for a specific date.
+
+    Everything after driver is keyword-only: this used to take the list
+    of all bookings in the second position, and now takes only the
+    driver's own stops.
 
     Args:
-        route: Current driver route
-        new_address: Address of new delivery
-        new_coords: Optional coordinates to use instead of geocoding
+        driver: Driver object with id and name
+        driver_stops: The driver's (stop type, booking) pairs for the date,
+            as grouped by index_stops_by_driver
+        date: Date string (YYYY-MM-DD)
+        coords_by_address: Optional already geocoded coordinates for
+            bookings that don't carry their own. When given, addresses
+            missing from it (or mapped to None) are not geocoded again;
+            those stops are left without coordinates
 
     Returns:
-        Additional miles added to route (best insertion point)
+        Frozen DriverRoute object with all stops. Routes are cached by
+        their stops and shared between calls, so they can't be modified.
     """
-    if not new_coords:
-        new_coords = geocode_address(new_address)
-        if not new_coords:
-            logger.warning(f"Could not geocode address: {new_address}")
-            return float("inf")
-
-    # If route is empty, no disruption
-    if len(route.stops) == 0:
-        return 0.0
-
-    # If only one stop, calculate distance to that stop
-    if len(route.stops) == 1:
-        stop = route.stops[0]
-        if stop.coords:
-            lat1, lon1 = stop.coords
-            lat2, lon2 = new_coords
-            return haversine_distance_miles(lat1, lon1, lat2, lon2)
-        return float("inf")
-
-    # Find best insertion point in route
-    min_added_distance = float("inf")
-
-    for i in range(len(route.stops)):
-        # Try inserting new stop between position i and i+1
-        if i == len(route.stops) - 1:
-            # Insert at end
-            stop = route.stops[i]
-            if stop.coords:
-                lat1, lon1 = stop.coords
-                lat2, lon2 = new_coords
-                added = haversine_distance_miles(lat1, lon1, lat2, lon2)
-                min_added_distance = min(min_added_distance, added)
-        else:
-            # Insert in middle
-            stop1 = route.stops[i]
-            stop2 = route.stops[i + 1]
-
-            if stop1.coords and stop2.coords:
-                lat1, lon1 = stop1.coords
-                lat2, lon2 = new_coords
-                lat3, lon3 = stop2.coords
-
-                # Calculate: distance(stop1 -> new) + distance(new -> stop2)
-                # Minus the original distance(stop1 -> stop2)
-                original = haversine_distance_miles(lat1, lon1, lat3, lon3)
-                with_new = haversine_distance_miles(
-                    lat1, lon1, lat2, lon2
-                ) + haversine_distance_miles(lat2, lon2, lat3, lon3)
-                added = with_new - original
-                min_added_distance = min(min_added_distance, added)
-
-    return max(0.0, min_added_distance)
-
-
-def calculate_distance_to_address(
-    route: DriverRoute, target_address: str, target_coords: Optional[Tuple[float, float]] = None
-) -> float:
+    stops = []
+    for stop_type, booking in driver_stops:
+        # Get coordinates from booking if available
+        coords = None
+        if booking.get("delivery_lat") and booking.get("delivery_lng"):
+            coords = (booking["delivery_lat"], booking["delivery_lng"])
+        elif coords_by_address is not None:
+            coords = coords_by_address.get(booking.get("delivery_address"))
+            if not coords:
+                logger.warning(
+                    f"No coordinates for stop at {booking.get('delivery_address')!r}; "
+                    f"leaving it out of distance calculations"
+                )
+
+        stops.append((
+            stop_type,
+            booking["id"],
+            booking["delivery_address"],
+            _quantize(*coords) if coords else None,
+        ))
+
+    return _build_route(
+        driver["id"], driver["name"], date, tuple(stops), coords_by_address is None
+    )
+
+
+def _quantize(lat: float, lon: float) -> Tuple[int, int]:
     """
-    Calculate closest distance from driver's route to target address.
+    Round coordinates to integer units of 1/COORD_SCALE degrees.
+
+    Used for route cache keys, so coordinates that differ only by float
+    noise (33.6411 vs 33.641100000001) share a cached route.
 
     Args:
-        route: Driver's current route
-        target_address: Address to check distance to
-        target_coords: Optional coordinates to use instead of geocoding
+        lat: Latitude in degrees
+        lon: Longitude in degrees
 
     Returns:
-        Distance in miles to closest stop (0.0 if route is empty)
+        Tuple of (latitude, longitude) as scaled integers
     """
-    if not target_coords:
-        target_coords = geocode_address(target_address)
-        if not target_coords:
-            return float("inf")
+    return round(lat * COORD_SCALE), round(lon * COORD_SCALE)
 
-    # If driver has no stops, return 0 (they're available for any location)
-    if len(route.stops) == 0:
-        return 0.0
 
-    min_distance = float("inf")
-    target_lat, target_lon = target_coords
+@lru_cache(maxsize=1024)
+def _build_route(
+    driver_id: int,
+    driver_name: str,
+    date: str,
+    stops: Tuple[Tuple[str, int, str, Optional[Tuple[int, int]]], ...],
+    geocode: bool = True,
+) -> DriverRoute:
+    """
+    Build a route from its stops, reusing routes built before.
+
+    The key holds everything the route is built from, so any change to a
+    driver's bookings gives a new key and cached routes never go stale.
+    Returned routes are shared between calls, so they're frozen.
+
+    Args:
+        driver_id: Driver ID
+        driver_name: Driver name
+        date: Date string (YYYY-MM-DD)
+        stops: (stop type, booking id, address, coords) for each stop,
+            with coords quantized by _quantize
+        geocode: Geocode the addresses of stops without coords
+
+    Returns:
+        Frozen DriverRoute object with all stops
+    """
+    route = DriverRoute(driver_id, driver_name, date)
 
-    for stop in route.stops:
-        if stop.coords:
-            lat, lon = stop.coords
-            distance = haversine_distance_miles(lat, lon, target_lat, target_lon)
-            min_distance = min(min_distance, distance)
+    for stop_type, booking_id, address, quantized in stops:
+        coords = None
+        if quantized:
+            coords = (quantized[0] / COORD_SCALE, quantized[1] / COORD_SCALE)
+
+        # Time window is not tracked per booking yet, so assume the
+        # whole working day. In production, use actual time slots
+        stop = Stop(
+            address=address,
+            time_window=(time(9, 0), time(17, 0)),
+            stop_type=stop_type,
+            booking_id=booking_id,
+            coords=coords,
+            geocode=geocode,
+        )
+        route.add_stop(stop)
 
-    return min_distance
+    route.freeze()
+    return route
 
 
 def has_time_conflict(
-    route: DriverRoute, delivery_date: str, pickup_date: str
+    route: DriverRoute,
+    delivery_date: str,
+    pickup_date: str,
+    time_window: Optional[Tuple[time, time]] = None,
 ) -> bool:
     """
     Check if driver has time conflicts for new booking.
@@ -269,18 +217,53 @@ def has_time_conflict(
         route: Driver's current route
         delivery_date: Delivery date (YYYY-MM-DD)
         pickup_date: Pickup date (YYYY-MM-DD)
+        time_window: Optional (start, end) of the new delivery; checked
+            against the windows of the stops already on the route
 
     Returns:
         True if there's a time conflict
     """
-    # Simple conflict check: if driver already has 8+ stops on that day,
-    # consider them at capacity
-    # In production, implement proper time window conflict checking
+    if delivery_date != route.date:
+        return False
 
-    if delivery_date == route.date and len(route.stops) >= 8:
+    # If driver already has 8+ stops on that day, consider them at capacity
+    if len(route.stops) >= 8:
         return True
 
-    return False
+    # Stops are built with whole-day windows until bookings carry their
+    # own, so recommend_drivers only relies on the capacity check for now
+    return time_window is not None and route.overlaps(time_window)
+
+
+def _addresses_to_geocode(
+    active_drivers: List[Dict],
+    stops_by_driver: Dict[int, List[Tuple[str, Dict]]],
+    new_booking: Dict,
+) -> List[str]:
+    """
+    List the addresses recommend_drivers needs that lack coordinates.
+
+    Args:
+        active_drivers: Drivers being considered
+        stops_by_driver: Stops on the delivery date, from index_stops_by_driver
+        new_booking: New booking that needs driver assignment
+
+    Returns:
+        Stop addresses of the active drivers, plus the new delivery
+        address, wherever the booking has no coordinates (may repeat)
+    """
+    addresses = [
+        booking["delivery_address"]
+        for driver in active_drivers
+        for _, booking in stops_by_driver.get(driver["id"], ())
+        if not (booking.get("delivery_lat") and booking.get("delivery_lng"))
+    ]
+    if active_drivers and not (
+        new_booking.get("delivery_lat") and new_booking.get("delivery_lng")
+    ):
+        addresses.append(new_booking["delivery_address"])
+
+    return addresses
 
 
 def recommend_drivers(
@@ -288,6 +271,9 @@ def recommend_drivers(
     bookings: List[Dict],
     new_booking: Dict,
     max_recommendations: int = 5,
+    coords_by_address: Optional[Dict[str, Optional[Tuple[float, float]]]] = None,
+    refine_routes: bool = True,
+    prune: bool = True,
 ) -> List[DriverRecommendation]:
     """
     Recommend drivers for a new booking based on route optimization.
@@ -297,6 +283,13 @@ def recommend_drivers(
         bookings: List of all existing bookings
         new_booking: New booking that needs driver assignment
         max_recommendations: Maximum number of drivers to recommend
+        coords_by_address: Optional already geocoded coordinates; only
+            addresses missing from it are geocoded here
+        refine_routes: Re-score the top drivers using 2-opt improved
+            routes (see refined_route_disruption)
+        prune: Skip scoring drivers whose distance lower bound rules them
+            out of the top max_recommendations; the result is the same
+            either way, this only saves work
 
     Returns:
         Sorted list of DriverRecommendation objects (best first)
@@ -314,57 +307,188 @@ def recommend_drivers(
         logger.error("Booking missing delivery_date or delivery_address")
         return []
 
-    recommendations = []
+    if max_recommendations <= 0:
+        return []
 
-    for driver in drivers:
-        # Only consider active drivers
-        if not driver.get("is_active", True):
-            continue
+    # Group every stop on the delivery date by driver once, instead of
+    # scanning all bookings for each driver
+    stops_by_driver = index_stops_by_driver(bookings, delivery_date)
+    active_drivers = [
+        driver for driver in drivers if driver.get("is_active", True)
+    ]
+
+    # Geocode every distinct address that lacks coordinates (the new
+    # delivery and existing stops) in one batch up front, instead of
+    # once per stop while building routes
+    coords_by_address = dict(coords_by_address or {})
+    addresses_to_geocode = [
+        address
+        for address in _addresses_to_geocode(active_drivers, stops_by_driver, new_booking)
+        if address not in coords_by_address
+    ]
+    coords_by_address.update(geocode_addresses(addresses_to_geocode))
+    if not new_coords:
+        new_coords = coords_by_address.get(delivery_address)
+        if not new_coords:
+            logger.warning(f"Could not geocode address: {delivery_address}")
+            return []
 
+    # Build routes and drop drivers at capacity
+    candidates = []
+    for index, driver in enumerate(active_drivers):
         # Build driver's route for the delivery date
-        route = build_driver_route(driver, bookings, delivery_date)
+        route = build_driver_route(
+            driver,
+            driver_stops=stops_by_driver.get(driver["id"], []),
+            date=delivery_date,
+            coords_by_address=coords_by_address,
+        )
 
         # Check for time conflicts
         if has_time_conflict(route, delivery_date, pickup_date):
             continue
 
+        # Disruption is never negative, so a driver can't score below
+        # 40% of their distance lower bound plus the workload penalty
+        workload_penalty = len(route.stops) * 0.5
+        min_score = workload_penalty
+        if new_coords:
+            min_score += distance_lower_bound(route, new_coords) * 0.4
+
+        candidates.append((min_score, index, driver, route))
+
+    # Score the most promising drivers first so the rest can be pruned
+    candidates.sort(key=lambda c: c[0])
+
+    # The best max_recommendations so far as a max-heap on (score, index),
+    # negated so the worst one is on top and can be replaced cheaply
+    best: List[Tuple[float, int, Dict, DriverRoute, float, float]] = []
+
+    for min_score, index, driver, route in candidates:
+        # Once the list is full, skip drivers who can't beat its worst entry;
+        # candidates are sorted, so none of the remaining ones can either
+        if prune and len(best) == max_recommendations and min_score > -best[0][0]:
+            break
+
         # Calculate metrics using provided coordinates
-        disruption = calculate_route_disruption(route, delivery_address, new_coords)
-        distance = calculate_distance_to_address(route, delivery_address, new_coords)
+        distance, disruption = rank_driver_route(route, new_coords)
 
         # Handle cases where geocoding failed
         if disruption == float("inf") or distance == float("inf"):
             continue
 
-        # Calculate score (lower is better)
-        # Weight: 60% disruption, 40% distance
-        # Add penalty for busy drivers (more stops = lower priority)
-        workload_penalty = len(route.stops) * 0.5
-        score = (disruption * 0.6) + (distance * 0.4) + workload_penalty
-
-        # Generate reason
-        if len(route.stops) == 0:
-            reason = "No existing deliveries - fresh route"
-        elif disruption < 2.0:
-            reason = f"Minimal disruption ({disruption:.1f}mi added)"
-        elif distance < 5.0:
-            reason = f"Close to existing route ({distance:.1f}mi away)"
+        score = _score(route, distance, disruption)
+
+        # Ties go to the driver listed first
+        if len(best) == max_recommendations and (-score, -index) <= best[0][:2]:
+            continue
+
+        entry = (-score, -index, driver, route, distance, disruption)
+        if len(best) < max_recommendations:
+            heappush(best, entry)
         else:
-            reason = f"{len(route.stops)} stops, {disruption:.1f}mi added"
-
-        recommendation = DriverRecommendation(
-            driver_id=driver["id"],
-            driver_name=driver["name"],
-            score=score,
-            distance_to_delivery=distance,
-            route_disruption=disruption,
-            current_stops=len(route.stops),
-            reason=reason,
-        )
+            heapreplace(best, entry)
+
+    top = [(-score, -index, *rest) for score, index, *rest in best]
+
+    if refine_routes:
+        # Re-score the shortlist against 2-opt improved routes, which
+        # ranks drivers by what the booking really adds to their day
+        # rather than by an insertion into their current stop order
+        refined = []
+        for _, index, driver, route, distance, _ in top:
+            disruption = refined_route_disruption(route, new_coords)
+            score = _score(route, distance, disruption)
+            refined.append((score, index, driver, route, distance, disruption))
+        top = refined
+
+    # Sort by score (lower is better), ties in the order drivers were given
+    top.sort(key=lambda t: t[:2])
+
+    return [
+        _recommendation(driver, route, score, distance, disruption)
+        for score, _, driver, route, distance, disruption in top
+    ]
 
-        recommendations.append(recommendation)
 
-    # Sort by score (lower is better)
-    recommendations.sort(key=lambda r: r.score)
+def _score(route: DriverRoute, distance: float, disruption: float) -> float:
+    """
+    Score a driver for a new booking (lower is better).
+
+    Weight: 60% disruption, 40% distance, plus a penalty for busy
+    drivers (more stops = lower priority).
+    """
+    workload_penalty = len(route.stops) * 0.5
+    return (disruption * 0.6) + (distance * 0.4) + workload_penalty
+
+
+def _recommendation(
+    driver: Dict, route: DriverRoute, score: float, distance: float, disruption: float
+) -> DriverRecommendation:
+    """Build a driver's recommendation, explaining the main reason for it."""
+    if len(route.stops) == 0:
+        reason = "No existing deliveries - fresh route"
+    elif disruption < 2.0:
+        reason = f"Minimal disruption ({disruption:.1f}mi added)"
+    elif distance < 5.0:
+        reason = f"Close to existing route ({distance:.1f}mi away)"
+    else:
+        reason = f"{len(route.stops)} stops, {disruption:.1f}mi added"
+
+    return DriverRecommendation(
+        driver_id=driver["id"],
+        driver_name=driver["name"],
+        score=score,
+        distance_to_delivery=distance,
+        route_disruption=disruption,
+        current_stops=len(route.stops),
+        reason=reason,
+    )
+
+
+async def recommend_drivers_async(
+    drivers: List[Dict],
+    bookings: List[Dict],
+    new_booking: Dict,
+    max_recommendations: int = 5,
+    refine_routes: bool = True,
+) -> List[DriverRecommendation]:
+    """
+    Recommend drivers for a new booking without blocking the event loop.
+
+    Addresses that lack coordinates are geocoded concurrently with the
+    async geocoder, then recommend_drivers does the scoring in a worker
+    thread.
+
+    Args:
+        drivers: List of all driver objects
+        bookings: List of all existing bookings
+        new_booking: New booking that needs driver assignment
+        max_recommendations: Maximum number of drivers to recommend
+        refine_routes: Re-score the top drivers using 2-opt improved routes
+
+    Returns:
+        Sorted list of DriverRecommendation objects (best first)
+    """
+    coords_by_address = {}
+
+    delivery_date = new_booking.get("delivery_date")
+    if delivery_date and new_booking.get("delivery_address"):
+        active_drivers = [
+            driver for driver in drivers if driver.get("is_active", True)
+        ]
+        coords_by_address = await geocode_addresses_async(
+            _addresses_to_geocode(
+                active_drivers, index_stops_by_driver(bookings, delivery_date), new_booking
+            )
+        )
 
-    return recommendations[:max_recommendations]
+    return await asyncio.to_thread(
+        recommend_drivers,
+        drivers,
+        bookings,
+        new_booking,
+        max_recommendations,
+        coords_by_address,
+        refine_routes,
+    )
@@ -0,0 +1,213 @@
+"""
+Distance calculations on driver routes.
+
+Ranks how close a route passes to a new stop and how far it adds, bounds
+that distance cheaply for pruning, and improves stop order with 2-opt.
+"""
+
+from math import asin, cos, radians, sin, sqrt
+from typing import List, Tuple
+
+from services.driver_route import DriverRoute
+from services.geocoding import EARTH_RADIUS_MILES, fast_distance_miles
+
+
+def rank_driver_route(
+    route: DriverRoute, target_coords: Tuple[float, float]
+) -> Tuple[float, float]:
+    """
+    Calculate a route's distance to and disruption for a target in one pass.
+
+    Walks the route once: each stop's distance to the target is computed
+    a single time and reused for both the closest stop and the legs on
+    either side of it, with no intermediate lists.
+
+    Args:
+        route: Driver's current route
+        target_coords: (latitude, longitude) of the new stop
+
+    Returns:
+        Tuple of (miles to the closest stop, miles added at the best
+        insertion point); both 0.0 for an empty route and inf if no
+        stop could be geocoded
+    """
+    if len(route.stops) == 0:
+        return 0.0, 0.0
+
+    inf = float("inf")
+    new_lat, new_lon = target_coords
+
+    min_distance = inf
+    min_added = inf
+    # Previous stop and its distance to the target (None if not geocoded)
+    prev_lat = prev_lon = prev_to_new = None
+
+    for lat, lon in zip(route.lats, route.lons):
+        if lat is None:
+            prev_to_new = None
+            continue
+
+        to_new = fast_distance_miles(lat, lon, new_lat, new_lon)
+        if to_new < min_distance:
+            min_distance = to_new
+
+        # Inserting between the previous stop and this one adds
+        # distance(prev -> new) + distance(new -> this) - distance(prev -> this)
+        if prev_to_new is not None:
+            added = (prev_to_new + to_new) - fast_distance_miles(prev_lat, prev_lon, lat, lon)
+            if added < min_added:
+                min_added = added
+
+        prev_lat, prev_lon, prev_to_new = lat, lon, to_new
+
+    # Appending after the last stop adds just the distance to it
+    if prev_to_new is not None and prev_to_new < min_added:
+        min_added = prev_to_new
+
+    return min_distance, max(0.0, min_added)
+
+
+def two_opt_refine(
+    lats: List[float], lons: List[float], max_iter: int = 100
+) -> List[int]:
+    """
+    Improve the order of a route's stops with 2-opt.
+
+    Repeatedly reverses a run of stops whenever that shortens the route,
+    until no reversal helps or max_iter passes have been made. The route
+    is an open path and its first stop stays first.
+
+    Args:
+        lats: Latitude of each stop, in route order
+        lons: Longitude of each stop, in route order
+        max_iter: Maximum number of passes over all reversals
+
+    Returns:
+        Stop indices in the improved order
+    """
+    n = len(lats)
+    dist = [
+        [fast_distance_miles(lats[a], lons[a], lats[b], lons[b]) for b in range(n)]
+        for a in range(n)
+    ]
+    order = list(range(n))
+
+    for _ in range(max_iter):
+        improved = False
+        for i in range(1, n - 1):
+            for j in range(i + 1, n):
+                # Reversing order[i..j] replaces legs (i-1 -> i) and
+                # (j -> j+1) with (i-1 -> j) and (i -> j+1)
+                a, b, c = order[i - 1], order[i], order[j]
+                delta = dist[a][c] - dist[a][b]
+                if j + 1 < n:
+                    d = order[j + 1]
+                    delta += dist[b][d] - dist[c][d]
+                # Ignore rounding-level gains so passes can't cycle
+                if delta < -1e-9:
+                    order[i:j + 1] = order[i:j + 1][::-1]
+                    improved = True
+        if not improved:
+            break
+
+    return order
+
+
+def _path_length(lats: List[float], lons: List[float], order: List[int]) -> float:
+    """Length in miles of visiting the given stops in order."""
+    return sum(
+        fast_distance_miles(lats[a], lons[a], lats[b], lons[b])
+        for a, b in zip(order, order[1:])
+    )
+
+
+def refined_route_disruption(
+    route: DriverRoute, new_coords: Tuple[float, float]
+) -> float:
+    """
+    Calculate the miles a new stop adds once both routes are 2-opt improved.
+
+    rank_driver_route only tries slotting the stop into the current
+    order. Here the route with the stop (starting from its best
+    insertion) and the route without it are both improved with
+    two_opt_refine before comparing their lengths, so a stop that lets
+    the driver reorder their day isn't overcharged. Stops that couldn't
+    be geocoded are left out.
+
+    Args:
+        route: Current driver route
+        new_coords: (latitude, longitude) of the new stop
+
+    Returns:
+        Additional miles added to route (inf if no stop could be geocoded)
+    """
+    if len(route.stops) == 0:
+        return 0.0
+
+    lats = [lat for lat in route.lats if lat is not None]
+    lons = [lon for lon in route.lons if lon is not None]
+    if not lats:
+        return float("inf")
+
+    new_lat, new_lon = new_coords
+    to_new = [fast_distance_miles(lat, lon, new_lat, new_lon) for lat, lon in zip(lats, lons)]
+
+    # Best place for the new stop in the current order: after stop k - 1
+    last = len(lats) - 1
+    insert_at = min(
+        range(1, len(lats) + 1),
+        key=lambda k: to_new[k - 1] if k > last else (
+            to_new[k - 1] + to_new[k]
+            - fast_distance_miles(lats[k - 1], lons[k - 1], lats[k], lons[k])
+        ),
+    )
+    new_lats = lats[:insert_at] + [new_lat] + lats[insert_at:]
+    new_lons = lons[:insert_at] + [new_lon] + lons[insert_at:]
+
+    before = _path_length(lats, lons, two_opt_refine(lats, lons))
+    after = _path_length(new_lats, new_lons, two_opt_refine(new_lats, new_lons))
+
+    return max(0.0, after - before)
+
+
+def distance_lower_bound(
+    route: DriverRoute, target_coords: Tuple[float, float]
+) -> float:
+    """
+    Cheap lower bound on the distance rank_driver_route gives for a route.
+
+    Uses the bounding box of the route's geocoded stops: every stop is at
+    least as far from the target in latitude and longitude as the box is,
+    and the haversine grows with both. Understated by 0.1% plus a little
+    to absorb floating point error and fast_distance_miles coming in just
+    under the haversine, so it never exceeds the real distance.
+
+    Args:
+        route: Driver's current route
+        target_coords: (latitude, longitude) of the target
+
+    Returns:
+        Lower bound in miles (0.0 if the route has no geocoded stops)
+    """
+    if route.bbox is None:
+        return 0.0
+
+    lat_min, lat_max, lon_min, lon_max = route.bbox
+    target_lat, target_lon = target_coords
+
+    dlat = max(lat_min - target_lat, target_lat - lat_max, 0.0)
+    if lon_min <= target_lon <= lon_max:
+        dlon = 0.0
+    else:
+        # Nearest box edge, measured either way around the globe
+        dlon = min(
+            min(d, 360.0 - d)
+            for d in (abs(target_lon - lon_min) % 360.0, abs(target_lon - lon_max) % 360.0)
+        )
+
+    # cos(lat) is smallest at the latitude furthest from the equator
+    cos_min = cos(radians(max(abs(lat_min), abs(lat_max), abs(target_lat))))
+    a = sin(radians(dlat) / 2) ** 2 + (cos_min * sin(radians(dlon) / 2)) ** 2
+    bound = 2 * EARTH_RADIUS_MILES * asin(sqrt(min(a, 1.0)))
+
+    return max(0.0, bound * 0.999 - 0.001)
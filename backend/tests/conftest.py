@@ -0,0 +1,140 @@
+"""
+Pytest configuration and shared fixtures for the API tests.
+
+Requests from the ``client`` fixture are served from an in-memory SQLite
+database seeded with a small, known data set, so the tests are fast and
+deterministic. The app's lifespan still runs migrations and the inventory
+cache warm-up against DATABASE_URL.
+
+The database lives in each process's memory, so every pytest-xdist worker
+gets its own copy and the tests can run in parallel with ``pytest -n auto``
+(backend/conftest.py gives each worker its own DATABASE_URL file too).
+"""
+
+from datetime import date, timedelta
+from decimal import Decimal
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+# In-memory database; StaticPool shares its single connection with every session
+engine = create_engine(
+    "sqlite:///:memory:",
+    connect_args={"check_same_thread": False},
+    poolclass=StaticPool,
+)
+
+TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+
+@pytest.fixture(scope="session", autouse=True)
+def _verify_route_optimizer_importable():
+    """
+    Verify once per session that services.route_optimizer can be imported.
+
+    This was failing in production due to PYTHONPATH issues.
+    """
+    try:
+        from services.route_optimizer import recommend_drivers
+    except ImportError as e:
+        pytest.fail(
+            f"Failed to import route_optimizer: {e}. "
+            f"Check PYTHONPATH is set correctly: "
+            f"export PYTHONPATH=/home/izzy4598/projects/Rental/backend/src"
+        )
+
+    assert callable(recommend_drivers), "recommend_drivers is not callable"
+
+
+def _seed(db) -> None:
+    """
+    Add a driver with one assigned booking, plus one unassigned booking.
+
+    Every booking has coordinates, so recommendations never geocode.
+    """
+    from backend.database.models import Booking, BookingStatus, Customer, Driver
+
+    customer = Customer(
+        name="John Doe",
+        email="john.doe@example.com",
+        phone="7145550101",
+        address="456 Customer Ave, Costa Mesa, CA 92626",
+        address_lat=Decimal("33.6415"),
+        address_lng=Decimal("-117.9190")
+    )
+    driver = Driver(
+        name="Mike Johnson",
+        email="mike@partay.com",
+        phone="7145550102",
+        license_number="D1234567",
+        is_active=True
+    )
+    db.add_all([customer, driver])
+    db.flush()
+
+    delivery_date = date.today() + timedelta(days=7)
+    shared = dict(
+        customer_id=customer.customer_id,
+        delivery_date=delivery_date,
+        pickup_date=delivery_date + timedelta(days=2),
+        subtotal=Decimal("250.00"),
+        delivery_fee=Decimal("50.00"),
+        tip=Decimal("0.00"),
+        total=Decimal("300.00"),
+        status=BookingStatus.CONFIRMED
+    )
+    db.add_all([
+        Booking(
+            delivery_address="456 Customer Ave, Costa Mesa, CA 92626",
+            delivery_lat=Decimal("33.6415"),
+            delivery_lng=Decimal("-117.9190"),
+            assigned_driver_id=driver.driver_id,
+            pickup_driver_id=driver.driver_id,
+            **shared
+        ),
+        Booking(
+            delivery_address="789 Harbor Blvd, Costa Mesa, CA 92627",
+            delivery_lat=Decimal("33.6550"),
+            delivery_lng=Decimal("-117.9300"),
+            **shared
+        ),
+    ])
+    db.commit()
+
+
+@pytest.fixture(scope="module")
+def client():
+    """
+    Create one test client for each test module that uses it.
+
+    Requests are served from the seeded in-memory database. The database
+    override is removed when the module finishes, so modules that make
+    their own client on the shared app still reach the real database.
+    Entering the client runs the app's lifespan (migrations, cache
+    warm-up) once per module, instead of once per test.
+    """
+    from backend.main import app
+    from backend.database.connection import get_db
+    from backend.database.models import Base
+
+    Base.metadata.create_all(bind=engine)
+    with TestingSessionLocal() as db:
+        _seed(db)
+
+    def override_get_db():
+        db = TestingSessionLocal()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    app.dependency_overrides[get_db] = override_get_db
+    try:
+        with TestClient(app) as test_client:
+            yield test_client
+    finally:
+        app.dependency_overrides.pop(get_db, None)
+        Base.metadata.drop_all(bind=engine)
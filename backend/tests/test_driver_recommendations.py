@@ -5,77 +5,113 @@ Catches the 500 error that breaks the Unassigned card.
 """
 
 import pytest
-from fastapi.testclient import TestClient
-from backend.main import app
 
-client = TestClient(app)
 
+# Fields the frontend reads from each recommendation
+_REQUIRED_REC_FIELDS = frozenset({
+    "driver_id",
+    "driver_name",
+    "score",
+    "distance_to_delivery",
+    "route_disruption",
+    "current_stops",
+    "reason",
+})
 
-class TestDriverRecommendationsEndpoint:
-    """Test driver recommendations endpoint returns 200 and proper data."""
 
-    def test_driver_recommendations_returns_200(self):
-        """
-        CRITICAL: Driver recommendations endpoint must return 200, not 500.
+def _extract_bookings(payload):
+    """
+    Get the list of bookings from an unassigned-bookings response.
 
-        This endpoint was returning 500 in production, causing CORS errors
-        and breaking the Unassigned card functionality.
-        """
-        # Get an unassigned booking
-        unassigned_response = client.get("/api/admin/drivers/unassigned-bookings")
-        assert unassigned_response.status_code == 200
+    Handles both response formats: a dict with "trips" (or the older
+    "bookings") key, or a bare list.
+    """
+    if isinstance(payload, dict):
+        return payload.get("trips", payload.get("bookings", []))
+    return payload
 
-        unassigned_data = unassigned_response.json()
 
-        # Handle both response formats: dict with "bookings" key or direct list
-        if isinstance(unassigned_data, dict):
-            unassigned_bookings = unassigned_data.get("bookings", [])
-        else:
-            unassigned_bookings = unassigned_data
+def check_recommendations_status(client, booking_id, expected):
+    """
+    Request recommendations for a booking and assert the status code.
 
-        if not unassigned_bookings:
-            pytest.skip("No unassigned bookings to test")
+    Returns:
+        The response, for further checks
+    """
+    response = client.get(f"/api/admin/drivers/recommendations/{booking_id}")
+    assert response.status_code == expected, (
+        f"Driver recommendations endpoint returned {response.status_code} "
+        f"for booking {booking_id!r} (expected {expected}). "
+        f"Error: {response.text}"
+    )
+    return response
 
-        booking_id = unassigned_bookings[0]["booking_id"]
 
-        # CRITICAL: This must return 200, not 500
-        recommendations_response = client.get(
-            f"/api/admin/drivers/recommendations/{booking_id}"
-        )
+@pytest.fixture(scope="module")
+def unassigned_bookings(client):
+    """
+    Fetch the unassigned-bookings listing once for the module.
 
-        assert recommendations_response.status_code == 200, (
-            f"Driver recommendations endpoint returned {recommendations_response.status_code} "
-            f"(expected 200). This breaks the Unassigned card functionality. "
-            f"Error: {recommendations_response.text}"
-        )
+    Returns:
+        Dict with the "id" of one unassigned booking and the "total"
+        number of unassigned bookings the endpoint reports
+    """
+    response = client.get("/api/admin/drivers/unassigned-bookings")
+    assert response.status_code == 200
 
-    def test_driver_recommendations_response_structure(self):
-        """
-        Validate driver recommendations response has expected structure.
+    data = response.json()
+    bookings = _extract_bookings(data)
+    assert bookings, "Test database should contain an unassigned booking"
 
-        Frontend expects specific fields to display recommendations properly.
-        """
-        # Get an unassigned booking
-        unassigned_response = client.get("/api/admin/drivers/unassigned-bookings")
-        unassigned_data = unassigned_response.json()
+    # New format reports {"total": N, "trips": [...]}; otherwise count
+    if isinstance(data, dict) and "total" in data:
+        total = data["total"]
+    else:
+        total = len(bookings)
+
+    return {"id": bookings[0]["booking_id"], "total": total}
+
+
+class TestDriverRecommendationsEndpoint:
+    """Test driver recommendations endpoint returns 200 and proper data."""
 
-        # Handle both response formats
-        if isinstance(unassigned_data, dict):
-            unassigned_bookings = unassigned_data.get("bookings", [])
-        else:
-            unassigned_bookings = unassigned_data
+    def test_driver_recommendations_response_structure(
+        self, monkeypatch, client, unassigned_bookings
+    ):
+        """
+        Validate driver recommendations response has expected structure.
 
-        if not unassigned_bookings:
-            pytest.skip("No unassigned bookings to test")
+        CRITICAL: The endpoint must return 200, not 500. It was returning
+        500 in production, causing CORS errors and breaking the Unassigned
+        card functionality. Frontend also expects specific fields to
+        display recommendations properly.
 
-        booking_id = unassigned_bookings[0]["booking_id"]
+        Only the response shape is checked here, so the route optimizer is
+        stubbed out with a fixed recommendation.
+        """
+        from services.route_optimizer import DriverRecommendation
+
+        async def fake_recommend_drivers_async(*args, **kwargs):
+            return [
+                DriverRecommendation(
+                    driver_id="stub-driver",
+                    driver_name="Stub Driver",
+                    score=1.0,
+                    distance_to_delivery=0.0,
+                    route_disruption=0.0,
+                    current_stops=0,
+                    reason="stub",
+                )
+            ]
 
-        # Get recommendations
-        response = client.get(f"/api/admin/drivers/recommendations/{booking_id}")
-        assert response.status_code == 200, (
-            f"Expected 200, got {response.status_code}. Response: {response.text}"
+        monkeypatch.setattr(
+            "services.route_optimizer.recommend_drivers_async",
+            fake_recommend_drivers_async,
         )
 
+        # CRITICAL: This must return 200, not 500, or the Unassigned card breaks
+        response = check_recommendations_status(client, unassigned_bookings["id"], 200)
+
         data = response.json()
 
         # Contract: Must include booking context
@@ -91,58 +127,54 @@ class TestDriverRecommendationsEndpoint:
 
         # Contract: Each recommendation must have required fields
         recommendations = data["recommendations"]
-        if len(recommendations) > 0:
-            rec = recommendations[0]
-            required_fields = [
-                "driver_id",
-                "driver_name",
-                "score",
-                "distance_to_delivery",
-                "route_disruption",
-                "current_stops",
-                "reason",
-            ]
-            for field in required_fields:
-                assert field in rec, (
-                    f"Missing required field '{field}' in recommendation. "
-                    f"Got keys: {rec.keys()}"
-                )
+        assert recommendations, "Expected the stubbed recommendation in the response"
+        rec = recommendations[0]
+        missing = _REQUIRED_REC_FIELDS - rec.keys()
+        assert not missing, (
+            f"Missing required fields {sorted(missing)} in recommendation. "
+            f"Got keys: {rec.keys()}"
+        )
 
-    def test_route_optimizer_import_works(self):
+    def test_driver_recommendations_with_route_optimizer(self, client, unassigned_bookings):
         """
-        Verify that services.route_optimizer can be imported.
+        Smoke test the endpoint with the real route optimizer.
 
-        This was failing in production due to PYTHONPATH issues.
+        Runs the async geocoding wrapper and the scoring on the seeded
+        driver, whose route already has a stop on the delivery date. All
+        seeded bookings have coordinates, so no geocoding requests are made.
         """
-        try:
-            from services.route_optimizer import recommend_drivers
-
-            assert callable(recommend_drivers), "recommend_drivers is not callable"
-        except ImportError as e:
-            pytest.fail(
-                f"Failed to import route_optimizer: {e}. "
-                f"Check PYTHONPATH is set correctly: "
-                f"export PYTHONPATH=/home/izzy4598/projects/Rental/backend/src"
+        response = check_recommendations_status(client, unassigned_bookings["id"], 200)
+
+        recommendations = response.json()["recommendations"]
+        assert recommendations, "Expected the seeded driver to be recommended"
+        for rec in recommendations:
+            missing = _REQUIRED_REC_FIELDS - rec.keys()
+            assert not missing, (
+                f"Missing required fields {sorted(missing)} in recommendation. "
+                f"Got keys: {rec.keys()}"
             )
-
-    def test_driver_recommendations_with_invalid_booking_id(self):
+        assert recommendations[0]["driver_name"] == "Mike Johnson"
+        assert recommendations[0]["current_stops"] > 0
+
+    @pytest.mark.parametrize(
+        "booking_id",
+        ["00000000-0000-0000-0000-000000000000", "not-a-booking-id"],
+    )
+    def test_driver_recommendations_with_invalid_booking_id(self, client, booking_id):
         """
         Test error handling for invalid booking IDs.
 
-        Should return 404, not 500.
+        Should return 404, not 500. The IDs are never seeded into the test
+        database, so the lookup misses without any per-test setup.
         """
-        fake_booking_id = "00000000-0000-0000-0000-000000000000"
-        response = client.get(f"/api/admin/drivers/recommendations/{fake_booking_id}")
-
-        assert response.status_code == 404, (
-            f"Expected 404 for invalid booking ID, got {response.status_code}"
-        )
+        response = check_recommendations_status(client, booking_id, 404)
+        assert response.json()["detail"] == "Booking not found"
 
 
 class TestDataConsistency:
     """Test data consistency between backend and frontend expectations."""
 
-    def test_unassigned_count_consistency(self):
+    def test_unassigned_count_consistency(self, client, unassigned_bookings):
         """
         CRITICAL: Unassigned count must be consistent across endpoints.
 
@@ -153,22 +185,8 @@ class TestDataConsistency:
         assert stats_response.status_code == 200
         stats_unassigned = stats_response.json()["unassigned_bookings"]
 
-        # Get actual unassigned bookings list
-        list_response = client.get("/api/admin/drivers/unassigned-bookings")
-        assert list_response.status_code == 200
-
-        list_data = list_response.json()
-
-        # Handle both response formats
-        if isinstance(list_data, dict):
-            # New format: {"total": N, "bookings": [...]}
-            if "total" in list_data:
-                actual_unassigned = list_data["total"]
-            else:
-                actual_unassigned = len(list_data.get("bookings", []))
-        else:
-            # Legacy format: [...]
-            actual_unassigned = len(list_data)
+        # Actual count, from the session's unassigned-bookings listing
+        actual_unassigned = unassigned_bookings["total"]
 
         # CONTRACT: These must match
         assert stats_unassigned == actual_unassigned, (
@@ -178,7 +196,7 @@ class TestDataConsistency:
             f"This causes frontend to show incorrect counts!"
         )
 
-    def test_bookings_have_required_driver_fields(self):
+    def test_bookings_have_required_driver_fields(self, client):
         """
         Validate all bookings have driver assignment fields.
 
@@ -187,12 +205,13 @@ class TestDataConsistency:
         response = client.get("/api/bookings/")
         assert response.status_code == 200
 
-        bookings = response.json()
-        for booking in bookings:
-            # Required fields for frontend to calculate unassigned trips
-            assert "assigned_driver_id" in booking, (
-                f"Booking {booking.get('booking_id')} missing assigned_driver_id"
-            )
-            assert "pickup_driver_id" in booking, (
-                f"Booking {booking.get('booking_id')} missing pickup_driver_id"
-            )
+        # Required fields for frontend to calculate unassigned trips
+        required = {"assigned_driver_id", "pickup_driver_id"}
+        incomplete = next(
+            (booking for booking in response.json() if not required <= booking.keys()),
+            None,
+        )
+        assert incomplete is None, (
+            f"Booking {incomplete.get('booking_id')} missing "
+            f"{sorted(required - incomplete.keys())}"
+        )